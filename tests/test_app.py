@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+import os
+
+import pytest
+
+from web.core import Settings
+from web.core.app import App
+from web.core.application import Route
+from web.core.statics import (
+    Static,
+    fingerprint_static
+)
+from web.core.urlmatch import split_path
+from web.http import (
+    HttpRequest,
+    HttpResponse,
+    HTTP_STATUS_200
+)
+
+
+async def detail(request, pk):
+    return HttpResponse(HTTP_STATUS_200, body=f'{request.method} {pk}'.encode())
+
+
+async def create(request):
+    return HttpResponse(HTTP_STATUS_200, body=b'created')
+
+
+def make_app(**options) -> App:
+    settings = Settings()
+    settings.TRACING = False
+    settings.STATIC_IO_WORKERS = 0
+    for name, value in options.items():
+        setattr(settings, name, value)
+
+    settings.router.add(split_path('/items/<int:pk>/'), detail, ('GET',))
+    settings.router.add(split_path('/items/'), create, ('POST',))
+    return App(settings)
+
+
+def route(
+        app: App,
+        method: str,
+        path: str,
+        headers: list = ()
+) -> HttpResponse:
+    request = HttpRequest(
+        {'method': method, 'path': path, 'headers': list(headers)})
+    return asyncio.run(app.routing(request))[1]
+
+
+def test_method():
+    response = route(make_app(), 'GET', '/items/5/')
+    assert (response.status_code, response.body) == (200, b'GET 5')
+
+
+def test_head_falls_back_to_get():
+    assert route(make_app(), 'HEAD', '/items/5/').status_code == 200
+
+
+def test_method_not_allowed():
+    response = route(make_app(), 'POST', '/items/5/')
+    assert response.status_code == 405
+    assert response.headers['allow'] == 'GET, HEAD'
+
+
+def test_not_found():
+    assert route(make_app(), 'GET', '/nope/').status_code == 404
+
+
+def test_trailing_slash_redirect():
+    response = route(make_app(TRAILING_SLASH='redirect'), 'GET', '/items/5')
+    assert response.status_code == 301
+    assert response.headers['location'] == '/items/5/'
+
+
+def test_trailing_slash_redirect_unknown_url():
+    app = make_app(TRAILING_SLASH='redirect')
+    assert route(app, 'GET', '/nope').status_code == 404
+
+
+def test_trailing_slash_strict():
+    app = make_app(TRAILING_SLASH='strict')
+    assert route(app, 'GET', '/items/5').status_code == 404
+
+
+def test_trailing_slash_ignore():
+    response = route(make_app(TRAILING_SLASH='ignore'), 'GET', '/items/5')
+    assert (response.status_code, response.body) == (200, b'GET 5')
+
+
+def fingerprinted_app(tmp_path, **options) -> tuple[App, str]:
+    path = tmp_path / 'app.js'
+    path.write_bytes(b'console.log(1)' * 100)
+    static = Static('/app.js/', str(path), 'text/javascript', True)
+    fingerprinted = fingerprint_static(static)
+    app = make_app(STATIC_WATCH=False, **options)
+    app.settings.set_statics(
+        {static.url: static, fingerprinted.url: fingerprinted},
+        {static.url: fingerprinted.url}
+    )
+    return app, fingerprinted.url
+
+
+def test_fingerprinted_rewritten(tmp_path):
+    app, url = fingerprinted_app(tmp_path)
+    response = route(app, 'GET', url)
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['cache-control']
+
+    path = tmp_path / 'app.js'
+    stat = os.stat(path)
+    path.write_bytes(b'console.log(2)' * 100)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert route(app, 'GET', url).status_code == 404
+    assert route(app, 'GET', '/app.js').status_code == 200
+
+
+def test_precompress_skips_fingerprinted(tmp_path, monkeypatch):
+    compressed = []
+    monkeypatch.setattr(
+        Static, 'precompress',
+        lambda static, cache, min_size: compressed.append(static.url))
+    app, _ = fingerprinted_app(tmp_path)
+    app.precompress()
+    assert compressed == ['/app.js/']
+
+
+def test_route_single_method():
+    route = Route.from_pattern('/one/', detail, 'get')
+    assert route.methods == ('GET',)
+    assert Route.from_pattern('/one/', detail, ['get', 'Post']).methods == (
+        'GET', 'POST')
+
+
+@pytest.mark.parametrize('cache_bytes', [0, 10])
+def test_precompressed_not_evicted(tmp_path, monkeypatch, cache_bytes):
+    compressed = []
+    monkeypatch.setattr('web.core.statics.encoders', {
+        'gzip': lambda data: compressed.append(data) or gzip.compress(data)
+    })
+    app, url = fingerprinted_app(tmp_path, STATIC_CACHE_BYTES=cache_bytes)
+    app.precompress()
+    assert len(compressed) == 1
+
+    for path in ('/app.js', url) * 5:
+        response = route(
+            app, 'GET', path, [(b'accept-encoding', b'gzip')])
+        assert response.headers['content-encoding'] == 'gzip'
+        assert gzip.decompress(response.body) == b'console.log(1)' * 100
+
+    assert len(compressed) == 1
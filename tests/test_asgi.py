@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from web.core import Settings
+from web.core.app import App
+from web.core.statics import Static
+
+DATA = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def asgi(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(DATA)
+    settings = Settings()
+    settings.TRACING = False
+    settings.STATIC_WATCH = False
+    settings.statics['/data.bin/'] = Static(
+        '/data.bin/', str(path), 'application/octet-stream')
+    return App(settings).asgi()
+
+
+def call(asgi, headers=(), extensions=None):
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/data.bin',
+        'headers': list(headers),
+        'extensions': extensions
+    }
+    asyncio.run(asgi(scope, receive, send))
+    return sent
+
+
+def body(sent) -> bytes:
+    assert not sent[-1]['more_body']
+    return b''.join(message['body'] for message in sent[1:])
+
+
+@pytest.mark.parametrize('extensions', [None, {}])
+def test_stream(asgi, extensions):
+    sent = call(asgi, extensions=extensions)
+    assert sent[0]['status'] == 200
+    assert (b'Content-Length', b'%d' % len(DATA)) in sent[0]['headers']
+    assert body(sent) == DATA
+
+
+def test_pathsend(asgi):
+    sent = call(asgi, extensions={'http.response.pathsend': {}})
+    assert sent[1]['type'] == 'http.response.pathsend'
+
+
+def test_range_is_not_sent_with_pathsend(asgi):
+    sent = call(
+        asgi,
+        [(b'range', b'bytes=100-199')],
+        {'http.response.pathsend': {}}
+    )
+    assert sent[0]['status'] == 206
+    assert body(sent) == DATA[100:200]
+
+
+def test_multipart_range(asgi):
+    sent = call(asgi, [(b'range', b'bytes=0-9,70000-70009')])
+    data = body(sent)
+    headers = dict(sent[0]['headers'])
+    assert int(headers[b'Content-Length']) == len(data)
+    assert DATA[:10] in data and DATA[70000:70010] in data
+
+
+@pytest.mark.parametrize('extensions', [None, {'http.response.pathsend': {}}])
+def test_file_removed(asgi, tmp_path, extensions):
+    (tmp_path / 'data.bin').unlink()
+    sent = call(asgi, extensions=extensions)
+    starts = [message for message in sent
+              if message['type'] == 'http.response.start']
+    assert [message['status'] for message in starts] == [404]
@@ -0,0 +1,48 @@
+import pytest
+
+from web.core.encoders import (
+    IDENTITY,
+    compressible,
+    negotiate,
+    parse_accept_encoding
+)
+
+AVAILABLE = ('gzip',)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding('gzip;q=0.5, BR, zstd;q=x') == {
+        'gzip': 0.5, 'br': 1.0, 'zstd': 0.0}
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    (None, IDENTITY),
+    ('', IDENTITY),
+    ('gzip', 'gzip'),
+    ('gzip, deflate', 'gzip'),
+    ('deflate', IDENTITY),
+    ('gzip;q=0', IDENTITY),
+    ('*', 'gzip'),
+    ('gzip;q=0.1, identity;q=1', IDENTITY),
+    ('gzip;q=0.5, identity;q=0.5', 'gzip'),
+    ('gzip;q=0.5, *;q=0.8', IDENTITY),
+    ('identity;q=0, gzip;q=0.1', 'gzip'),
+    ('*;q=0, gzip', 'gzip'),
+    ('identity;q=0', None),
+    ('*;q=0', None),
+    ('gzip;q=0, identity;q=0', None),
+    ('*;q=0, identity', IDENTITY)
+])
+def test_negotiate(accept_encoding, encoding):
+    assert negotiate(accept_encoding, AVAILABLE) == encoding
+
+
+def test_negotiate_without_encodings():
+    assert negotiate('gzip', ()) == IDENTITY
+    assert negotiate('gzip, identity;q=0', ()) is None
+
+
+def test_compressible():
+    assert compressible('text/css')
+    assert compressible('image/svg+xml')
+    assert not compressible('image/png')
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+from web.core.executor import (
+    IOExecutor,
+    run_io
+)
+
+
+def test_run():
+    async def main():
+        executor = IOExecutor(2)
+        try:
+            return await executor.run(sum, (1, 2, 3))
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(main()) == 6
+
+
+def test_run_in_place():
+    assert asyncio.run(run_io(None, sum, (1, 2))) == 3
+
+
+def test_cancelled_call_holds_its_slot():
+    async def main():
+        executor = IOExecutor(1)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        task = asyncio.create_task(executor.run(block))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        await asyncio.sleep(0.05)
+        # the thread still runs, so its slot is not free.
+        assert executor.slots.locked()
+        assert executor.running == 1
+
+        release.set()
+        assert await executor.run(sum, (1, 1)) == 2
+        assert executor.running == 0
+        executor.shutdown()
+
+    asyncio.run(main())
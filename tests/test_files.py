@@ -0,0 +1,73 @@
+import asyncio
+import socket
+
+from web.http import FileResponse
+from web.server.files import (
+    sock_sendfile,
+    transport_sendfile
+)
+
+
+def file_response(path) -> FileResponse:
+    response = FileResponse((200, 'OK'), str(path), size=100)
+    response.headers['Connection'] = 'keep-alive'
+    return response
+
+
+def received(left: socket.socket) -> bytes:
+    left.setblocking(False)
+    data = b''
+    try:
+        while chunk := left.recv(65536):
+            data += chunk
+    except BlockingIOError:
+        pass
+
+    return data
+
+
+def test_sock_sendfile(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'x' * 100)
+    left, right = socket.socketpair()
+    right.setblocking(False)
+
+    async def send():
+        loop = asyncio.get_running_loop()
+        await sock_sendfile(loop, right, file_response(path))
+
+    asyncio.run(send())
+    data = received(left)
+    assert data.startswith(b'HTTP/1.1 200 OK\r\n')
+    assert data.endswith(b'\r\n\r\n' + b'x' * 100)
+
+
+def test_sock_sendfile_removed(tmp_path):
+    left, right = socket.socketpair()
+    right.setblocking(False)
+
+    async def send():
+        loop = asyncio.get_running_loop()
+        await sock_sendfile(loop, right, file_response(tmp_path / 'gone'))
+
+    asyncio.run(send())
+    data = received(left)
+    assert data.startswith(b'HTTP/1.1 404 Not Found\r\n')
+    assert b'Connection: keep-alive\r\n' in data
+    assert data.count(b'HTTP/1.1') == 1
+
+
+def test_transport_sendfile_removed(tmp_path):
+    written = []
+
+    async def write(data):
+        written.append(data)
+
+    async def send():
+        loop = asyncio.get_running_loop()
+        await transport_sendfile(
+            loop, None, file_response(tmp_path / 'gone'), write)
+
+    asyncio.run(send())
+    assert len(written) == 1
+    assert written[0].startswith(b'HTTP/1.1 404 Not Found\r\n')
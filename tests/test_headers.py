@@ -0,0 +1,56 @@
+import pytest
+
+from web.http import Headers
+
+
+def test_case_insensitive():
+    headers = Headers({'Content-Type': 'text/html'})
+    assert headers['content-type'] == 'text/html'
+    assert headers.get(b'CONTENT-TYPE') == 'text/html'
+    assert 'Content-type' in headers
+    assert headers.get('missing', 'default') == 'default'
+
+
+def test_repeated_kept_in_order():
+    headers = Headers([('Set-Cookie', 'a=1'), ('Vary', 'Cookie'),
+                       ('set-cookie', 'b=2')])
+    assert headers.getlist('Set-Cookie') == ['a=1', 'b=2']
+    assert headers['set-cookie'] == 'a=1'
+    assert list(headers) == [('Set-Cookie', 'a=1'), ('Vary', 'Cookie'),
+                             ('set-cookie', 'b=2')]
+    assert len(headers) == 3
+
+
+def test_add_after_lookup():
+    headers = Headers({'Vary': 'Cookie'})
+    assert headers.getlist('vary') == ['Cookie']
+    headers.add('Vary', 'Accept-Encoding')
+    assert headers.getlist('vary') == ['Cookie', 'Accept-Encoding']
+
+
+def test_setitem_replaces_all():
+    headers = Headers([('Vary', 'Cookie'), ('ETag', '"x"'),
+                       ('Vary', 'Accept')])
+    headers['vary'] = 'Accept-Encoding'
+    assert headers.getlist('Vary') == ['Accept-Encoding']
+    assert headers['etag'] == '"x"'
+
+
+def test_delitem():
+    headers = Headers({'A': '1', 'B': '2'})
+    del headers['a']
+    assert 'A' not in headers
+    assert headers['b'] == '2'
+    with pytest.raises(KeyError):
+        del headers['a']
+    with pytest.raises(KeyError):
+        headers['a']
+
+
+def test_bytes_and_non_ascii():
+    headers = Headers([(b'X-Raw', b'\xff')])
+    assert headers['x-raw'] == '\xff'
+    headers.add('X-Name', 'é')
+    assert headers.raw[-1] == (b'X-Name', b'%C3%A9')
+    with pytest.raises(TypeError):
+        headers.add('X-Int', 1)
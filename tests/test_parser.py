@@ -0,0 +1,177 @@
+import pytest
+
+from web.server.exceptions import (
+    BadRequest,
+    ContentTooLarge
+)
+from web.server.parser import (
+    IDLE,
+    HEAD,
+    BODY,
+    MAX_HEAD_SIZE,
+    RequestParser,
+    error_response,
+    parse_head
+)
+
+CHUNKED_HEAD = (
+    b'POST / HTTP/1.1\r\n'
+    b'Transfer-Encoding: chunked\r\n\r\n'
+)
+
+
+def parse(data: bytes, max_body_size: int = 0):
+    parser = RequestParser(max_body_size)
+    parser.feed(data)
+    return parser.next_request()
+
+
+def body(data: bytes) -> bytes:
+    request, _ = parse(data)
+    return request.partition(b'\r\n\r\n')[2]
+
+
+def test_content_length():
+    assert body(
+        b'POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello') == b'hello'
+
+
+def test_incomplete_body():
+    assert parse(b'POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nhel') is None
+
+
+def test_chunked():
+    assert body(
+        CHUNKED_HEAD + b'5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\n\r\n'
+    ) == b'hello world'
+
+
+def test_chunked_trailers():
+    assert body(
+        CHUNKED_HEAD + b'5\r\nhello\r\n0\r\nX-Sum: 1\r\n\r\n') == b'hello'
+
+
+def test_chunked_fed_bytewise():
+    parser = RequestParser()
+    data = CHUNKED_HEAD + b'5\r\nhello\r\n0\r\n\r\n'
+    results = []
+    for index in range(len(data)):
+        parser.feed(data[index:index + 1])
+        results.append(parser.next_request())
+
+    assert results[:-1] == [None] * (len(data) - 1)
+    assert results[-1][0].endswith(b'\r\n\r\nhello')
+
+
+@pytest.mark.parametrize('size', [
+    b'-1', b'-5', b'+5', b'0x5', b'5_0', b' 5', b'', b'g'
+])
+def test_invalid_chunk_size(size):
+    with pytest.raises(BadRequest):
+        parse(CHUNKED_HEAD + size + b'\r\nhello\r\n0\r\n\r\n')
+
+
+def test_chunk_data_without_crlf():
+    with pytest.raises(BadRequest):
+        parse(CHUNKED_HEAD + b'5\r\nhelloXX0\r\n\r\n')
+
+
+def test_chunk_size_line_too_large():
+    parser = RequestParser(max_body_size=10)
+    parser.feed(CHUNKED_HEAD + b'5;' + b'x' * MAX_HEAD_SIZE)
+    with pytest.raises(BadRequest):
+        parser.next_request()
+
+
+def test_trailers_too_large():
+    parser = RequestParser(max_body_size=10)
+    parser.feed(CHUNKED_HEAD + b'0\r\n')
+    assert parser.next_request() is None
+    for _ in range(MAX_HEAD_SIZE // 1024):
+        parser.feed(b'X-Trailer: ' + b'x' * 1011 + b'\r\n')
+        assert parser.next_request() is None
+
+    parser.feed(b'X-Trailer: 1\r\n')
+    with pytest.raises(BadRequest):
+        parser.next_request()
+
+
+def test_trailer_line_too_large():
+    parser = RequestParser()
+    parser.feed(CHUNKED_HEAD + b'0\r\nX-Trailer: ' + b'x' * MAX_HEAD_SIZE)
+    with pytest.raises(BadRequest):
+        parser.next_request()
+
+
+@pytest.mark.parametrize('headers', [
+    b'Content-Length: 5\r\nContent-Length: 5\r\n',
+    b'Content-Length: 5\r\nContent-Length: 6\r\n',
+    b'Content-Length: 5, 6\r\n',
+    b'Content-Length: +5\r\n',
+    b'Content-Length: -5\r\n',
+    b'Content-Length: 5_0\r\n',
+    b'Content-Length : 5\r\n',
+    b'Content-Length: 5\r\nTransfer-Encoding: chunked\r\n',
+    b'Transfer-Encoding: chunked, gzip\r\n',
+    b'Transfer-Encoding: identity\r\n'
+])
+def test_ambiguous_length(headers):
+    with pytest.raises(BadRequest):
+        parse_head(b'POST / HTTP/1.1\r\n' + headers.removesuffix(b'\r\n'))
+
+
+def test_transfer_encoding_list():
+    head = b'POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\nTransfer-Encoding: chunked'
+    assert parse_head(head) == (True, 0, True)
+
+
+def test_content_too_large():
+    with pytest.raises(ContentTooLarge):
+        parse(b'POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n', 10)
+
+
+def test_chunked_too_large():
+    with pytest.raises(ContentTooLarge):
+        parse(CHUNKED_HEAD + b'6\r\nhello \r\n6\r\n', 10)
+
+
+def test_error_response():
+    assert error_response(BadRequest('x')).startswith(
+        b'HTTP/1.1 400 Bad Request\r\n')
+    assert error_response(ContentTooLarge(2, 1)).startswith(
+        b'HTTP/1.1 413 Content Too Large\r\n')
+
+
+def test_phase():
+    parser = RequestParser()
+    assert parser.phase == IDLE
+    parser.feed(b'POST / HTTP/1.1\r\n')
+    assert parser.next_request() is None and parser.phase == HEAD
+    parser.feed(b'Content-Length: 2\r\n\r\n')
+    assert parser.next_request() is None and parser.phase == BODY
+
+
+@pytest.mark.parametrize('head, keep_alive', [
+    (b'GET / HTTP/1.1', True),
+    (b'GET / HTTP/1.1\r\nConnection: close', False),
+    (b'GET / HTTP/1.0', False),
+    (b'GET / HTTP/1.0\r\nConnection: keep-alive', True)
+])
+def test_keep_alive(head, keep_alive):
+    assert parse_head(head)[0] is keep_alive
+
+
+def test_pipelined_requests():
+    parser = RequestParser()
+    parser.feed(
+        b'GET /a/ HTTP/1.1\r\n\r\n'
+        b'POST /b/ HTTP/1.1\r\nContent-Length: 2\r\n\r\nok'
+        b'GET /c/ HTTP/1.1\r\nConnection: close\r\n\r\n'
+        b'GET /d/'
+    )
+    requests = []
+    while (parsed := parser.next_request()) is not None:
+        requests.append((parsed[0].split(b' ')[1], parsed[1]))
+
+    assert requests == [(b'/a/', True), (b'/b/', True), (b'/c/', False)]
+    assert parser.pending and parser.phase == HEAD
@@ -0,0 +1,82 @@
+from web.http import HttpRequest
+from web.utils import lazy
+
+RAW = (
+    b'GET /a%20b/?x=1&y=2 HTTP/1.1\r\n'
+    b'Host: example.com\r\n'
+    b'Cookie: a=1; b=2\r\n'
+    b'X-Value: c:d\r\n\r\n'
+)
+
+
+class Counter:
+    __slots__ = (
+        'calls',
+        '_value'
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @lazy
+    def value(self) -> int:
+        self.calls += 1
+        return self.calls
+
+
+def test_lazy_computed_once():
+    counter = Counter()
+    assert counter.calls == 0
+    assert (counter.value, counter.value) == (1, 1)
+    assert counter.calls == 1
+
+
+def test_lazy_set_and_reset():
+    counter = Counter()
+    counter.value = 10
+    assert counter.value == 10 and counter.calls == 0
+
+    lazy.reset(counter, 'value', 'missing')
+    assert counter.value == 1
+    assert isinstance(Counter.value, lazy)
+
+
+def test_std_request():
+    request = HttpRequest({'client': ('127.0.0.1', 1)}).set_http(RAW)
+    assert not hasattr(request, '_headers')
+    assert (request.method, request.path, request.http_version) == (
+        'GET', '/a b/', '1.1')
+    assert request.query_string == 'x=1&y=2'
+    assert request.payload == {'x': '1', 'y': '2'}
+
+    assert request.headers['x-value'] == 'c:d'
+    assert request.headers is request.headers
+    assert request.cookies['a'] == '1'
+
+
+def test_raw_headers_iterated_before_headers():
+    request = HttpRequest().set_http(RAW)
+    assert len(list(request.raw_headers)) == 3
+    assert len(list(request.raw_headers)) == 3
+    assert request.headers['host'] == 'example.com'
+    assert request.cookies['b'] == '2'
+
+
+def test_asgi_request():
+    request = HttpRequest({
+        'method': 'POST',
+        'path': '/a%20b/',
+        'headers': [(b'host', b'example.com'), (b'cookie', b'a=1')]
+    }, b'x=1')
+    assert request.path == '/a b/'
+    assert request.headers['Host'] == 'example.com'
+    assert request.cookies['a'] == '1'
+    assert request.payload == {'x': '1'}
+
+
+def test_set_http_resets_parsed():
+    request = HttpRequest().set_http(RAW)
+    assert request.headers['host'] == 'example.com'
+    request.set_http(b'POST / HTTP/1.1\r\nHost: other\r\n\r\n')
+    assert request.headers['host'] == 'other'
+    assert request.cookies == {}
@@ -0,0 +1,96 @@
+import pytest
+
+from web.core.exceptions import InvalidUrlPattern
+from web.core.router import (
+    Router,
+    RouteCache
+)
+from web.core.urlmatch import split_path
+
+
+async def index():
+    pass
+
+
+async def detail():
+    pass
+
+
+async def new():
+    pass
+
+
+async def files():
+    pass
+
+
+def make_router() -> Router:
+    router = Router()
+    router.add(split_path('/'), index)
+    router.add(split_path('/items/<int:pk>/'), detail)
+    router.add(split_path('/items/new/'), new)
+    router.add(split_path('/files/<path:rest>/'), files)
+    return router
+
+
+def resolve(router: Router, path: str):
+    if (resolved := router.resolve(path)) is None:
+        return None
+
+    endpoint, values = resolved
+    view, names = endpoint.get('GET')
+    return view, dict(zip(names, values))
+
+
+def test_root():
+    assert resolve(make_router(), '/') == (index, {})
+
+
+def test_variable():
+    assert resolve(make_router(), '/items/5/') == (detail, {'pk': 5})
+
+
+def test_static_catalog_takes_precedence():
+    assert resolve(make_router(), '/items/new/') == (new, {})
+
+
+def test_no_match():
+    router = make_router()
+    assert router.resolve('/items/') is None
+    assert router.resolve('/items/x/') is None
+    assert router.resolve('/items/5/extra/') is None
+
+
+def test_greedy_path():
+    assert resolve(make_router(), '/files/a/b/c.txt/') == (
+        files, {'rest': 'a/b/c.txt'})
+
+
+def test_greedy_must_be_last():
+    with pytest.raises(InvalidUrlPattern):
+        Router().add(split_path('/<path:rest>/x/'), files)
+
+
+def test_variable_without_name():
+    with pytest.raises(InvalidUrlPattern):
+        Router().add(split_path('/<int:>/'), detail)
+
+
+def test_route_cache():
+    router = make_router()
+    cache = RouteCache(2, 1)
+    assert cache.resolve(router, '/items/5/') is not None
+    assert cache.resolve(router, '/items/5/') is not None
+    assert cache.resolve(router, '/nope/') is None
+    assert cache.resolve(router, '/nope/') is None
+    assert (cache.hits, cache.misses, cache.negative_hits) == (2, 2, 1)
+
+
+def test_route_cache_is_bounded():
+    router = make_router()
+    cache = RouteCache(1, 1)
+    for path in ('/items/1/', '/items/2/', '/a/', '/b/'):
+        cache.resolve(router, path)
+
+    assert list(cache.found) == ['/items/2/']
+    assert list(cache.not_found) == ['/b/']
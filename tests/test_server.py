@@ -0,0 +1,212 @@
+import asyncio
+import socket
+import types
+
+import pytest
+
+from web.server import ENGINES
+from web.server.parser import (
+    IDLE,
+    HEAD,
+    BODY
+)
+from web.server.protocol import HttpProtocol
+from web.server.state import ServerState
+
+TIMEOUT = 0.2
+
+app = types.SimpleNamespace(io_executor=None)
+
+
+class Transport:
+    def __init__(self) -> None:
+        self.written = []
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def close(self) -> None:
+        pass
+
+
+async def respond(app, request, client, keep_alive):
+    body = path = request.split(b' ')[1]
+    if path == b'/big':
+        body = b'x' * (16 << 20)
+
+    return (
+        b'HTTP/1.1 200 OK\r\n'
+        b'Content-Length: %d\r\n'
+        b'Connection: %s\r\n\r\n%s' % (
+            len(body), b'keep-alive' if keep_alive else b'close', body)
+    )
+
+
+def request(path: bytes, close: bool = False) -> bytes:
+    return b'GET %s HTTP/1.1\r\nHost: test\r\n%s\r\n' % (
+        path, b'Connection: close\r\n' if close else b'')
+
+
+async def read_response(reader) -> bytes:
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = int(head.partition(b'Content-Length: ')[2].split(b'\r\n')[0])
+    return await reader.readexactly(length)
+
+
+def serve(engine: str, client, state: ServerState):
+    """
+    Runs the engine on a local socket while
+    the client coroutine talks to it.
+    """
+    async def main():
+        sock = socket.create_server(('127.0.0.1', 0))
+        sock.setblocking(False)
+        server = asyncio.create_task(
+            ENGINES[engine](app, respond, sock, state))
+        try:
+            return await asyncio.wait_for(
+                client(sock.getsockname()[1]), 5)
+        finally:
+            server.cancel()
+            await asyncio.wait((server,))
+            for task in list(state.tasks):
+                task.cancel()
+            sock.close()
+
+    return asyncio.run(main())
+
+
+async def closed(reader) -> bool:
+    return await asyncio.wait_for(reader.read(), 2) == b''
+
+
+@pytest.fixture(params=sorted(ENGINES))
+def engine(request):
+    return request.param
+
+
+def test_keep_alive(engine):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request(b'/one'))
+        first = await read_response(reader)
+        writer.write(request(b'/two', close=True))
+        second = await read_response(reader)
+        return first, second, await closed(reader)
+
+    assert serve(engine, client, ServerState()) == (b'/one', b'/two', True)
+
+
+def test_pipelining(engine):
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request(b'/1') + request(b'/2') + request(b'/3', True))
+        return [await read_response(reader) for _ in range(3)]
+
+    assert serve(engine, client, ServerState()) == [b'/1', b'/2', b'/3']
+
+
+def test_client_disconnects_during_response(engine):
+    state = ServerState()
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request(b'/big'))
+        await reader.readexactly(1024)
+        writer.transport.abort()
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if not state.connections and not state.tasks:
+                break
+
+        return state.connections, len(state.tasks)
+
+    assert serve(engine, client, state) == (0, 0)
+
+
+def test_write_waits_while_paused():
+    async def main():
+        protocol = HttpProtocol(app, respond, ServerState())
+        protocol.transport = transport = Transport()
+        protocol.pause_writing()
+        write = asyncio.create_task(protocol.write(b'data'))
+        await asyncio.sleep(0.01)
+        assert transport.written == []
+
+        protocol.resume_writing()
+        await write
+        assert transport.written == [b'data']
+
+        protocol.pause_writing()
+        write = asyncio.create_task(protocol.write(b'lost'))
+        await asyncio.sleep(0.01)
+        protocol.connection_lost(None)
+        await asyncio.wait_for(write, 1)
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('data, phase', [
+    (b'', IDLE),
+    (b'GET / HTTP/1.1\r\n', HEAD),
+    (b'POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\nab', BODY)
+])
+def test_read_timeout(engine, data, phase):
+    state = ServerState(timeouts={IDLE: TIMEOUT, HEAD: TIMEOUT, BODY: TIMEOUT})
+    timeouts = state.stats.timeouts[phase]
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(data)
+        return await closed(reader)
+
+    assert serve(engine, client, state)
+    assert state.stats.timeouts[phase] == timeouts + 1
+
+
+def test_keep_alive_timeout(engine):
+    state = ServerState(timeouts={IDLE: TIMEOUT})
+    timeouts = state.stats.timeouts[IDLE]
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request(b'/one'))
+        return await read_response(reader), await closed(reader)
+
+    assert serve(engine, client, state) == (b'/one', True)
+    assert state.stats.timeouts[IDLE] == timeouts + 1
+
+
+def test_drain_closes_idle_only(engine):
+    state = ServerState()
+
+    async def client(port):
+        idle_reader, _ = await asyncio.open_connection('127.0.0.1', port)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'POST / HTTP/1.1\r\nContent-Length: 4\r\n\r\nab')
+        await asyncio.sleep(0.1)
+        assert len(state.idle) == 1
+
+        drain = asyncio.create_task(state.drain(5))
+        assert await closed(idle_reader)
+        writer.write(b'cd')
+        response = await read_response(reader)
+        drain.cancel()
+        return response
+
+    assert serve(engine, client, state) == b'/'
+
+
+def test_service_unavailable(engine):
+    state = ServerState(max_connections=1)
+
+    async def client(port):
+        first, writer = await asyncio.open_connection('127.0.0.1', port)
+        second, _ = await asyncio.open_connection('127.0.0.1', port)
+        rejected = await asyncio.wait_for(second.read(), 2)
+        writer.write(request(b'/one', close=True))
+        return rejected, await read_response(first)
+
+    rejected, response = serve(engine, client, state)
+    assert rejected.startswith(b'HTTP/1.1 503 Service Unavailable\r\n')
+    assert response == b'/one'
@@ -0,0 +1,23 @@
+from web.server.state import ServerState
+
+
+def test_admission():
+    state = ServerState(max_connections=2)
+    assert state.admit() and state.admit()
+    assert not state.admit()
+    assert state.connections == 2
+    assert state.stats.rejected >= 1
+
+    state.release()
+    assert state.admit()
+
+
+def test_unlimited():
+    state = ServerState()
+    assert all(state.admit() for _ in range(100))
+
+
+def test_no_admission_while_draining():
+    state = ServerState()
+    state.draining = True
+    assert not state.admit()
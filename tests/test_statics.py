@@ -0,0 +1,157 @@
+import asyncio
+import gzip
+import os
+
+import pytest
+
+from web.core.statics import (
+    MAX_RANGES,
+    Static,
+    StaticCache,
+    parse_range
+)
+from web.http import (
+    FileResponse,
+    Headers
+)
+
+SIZE = 1000
+
+
+@pytest.mark.parametrize('header, ranges', [
+    ('bytes=0-9', [(0, 9)]),
+    ('bytes=990-', [(990, 999)]),
+    ('bytes=-10', [(990, 999)]),
+    ('bytes=-2000', [(0, 999)]),
+    ('bytes=995-2000', [(995, 999)]),
+    ('bytes=0-0, 10-19', [(0, 0), (10, 19)]),
+    ('BYTES = 0-9', [(0, 9)]),
+    ('bytes=2000-', []),
+    ('bytes=-0', []),
+    ('bytes=100-199,0-9', [(0, 9), (100, 199)])
+])
+def test_parse_range(header, ranges):
+    assert parse_range(header, SIZE) == ranges
+
+
+@pytest.mark.parametrize('header', [
+    'items=0-9',
+    'bytes=9-0',
+    'bytes=-',
+    'bytes=a-b',
+    'bytes=0-9;x',
+    'bytes=0'
+])
+def test_parse_range_invalid(header):
+    assert parse_range(header, SIZE) is None
+
+
+@pytest.mark.parametrize('header, ranges', [
+    ('bytes=' + ','.join(['0-'] * 16), [(0, 999)]),
+    ('bytes=0-9,5-19,20-29', [(0, 29)]),
+    ('bytes=50-59,0-9,10-10', [(0, 10), (50, 59)]),
+    ('bytes=-100,0-', [(0, 999)])
+])
+def test_parse_range_coalesces(header, ranges):
+    assert parse_range(header, SIZE) == ranges
+
+
+def test_parse_range_too_many():
+    specs = ','.join(f'{index * 10}-{index * 10}'
+                     for index in range(MAX_RANGES + 1))
+    assert parse_range(f'bytes={specs}', SIZE) is None
+
+
+@pytest.fixture
+def static(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(bytes(range(256)) * 4)
+    return Static('/data.bin/', str(path), 'application/octet-stream')
+
+
+def test_single_range(static):
+    response = static.get_range_response(Headers({'Range': 'bytes=1-3'}))
+    assert response.status_code == 206
+    assert response.read() == bytes([1, 2, 3])
+    assert response.headers['content-range'] == 'bytes 1-3/1024'
+
+
+def test_multipart_range(static):
+    response = static.get_range_response(
+        Headers({'Range': 'bytes=0-1,10-11'}))
+    body = response.read()
+    assert isinstance(response, FileResponse)
+    assert response.size == len(body)
+    assert b'Content-Range: bytes 0-1/1024\r\n\r\n\x00\x01\r\n' in body
+    assert b'Content-Range: bytes 10-11/1024\r\n\r\n\n\x0b\r\n' in body
+
+
+def test_unsatisfiable_range(static):
+    response = static.get_range_response(Headers({'Range': 'bytes=5000-'}))
+    assert response.status_code == 416
+    assert response.headers['content-range'] == 'bytes */1024'
+
+
+def test_if_range_mismatch(static):
+    headers = Headers({'Range': 'bytes=0-1', 'If-Range': '"other"'})
+    assert static.get_range_response(headers) is None
+
+
+def test_variant_cached(static):
+    cache = StaticCache(1 << 20, revalidate=0)
+    etag, data = asyncio.run(static.variant('gzip', cache))
+    assert etag == static.etag
+    assert gzip.decompress(data) == bytes(range(256)) * 4
+    assert cache.bytes == 1024 + len(data)
+
+    assert asyncio.run(static.variant('gzip', cache)) == (etag, data)
+    assert cache.hits == 1
+
+
+def test_variant_follows_etag(static):
+    cache = StaticCache(1 << 20, revalidate=0)
+    etag, _ = asyncio.run(static.variant('gzip', cache))
+
+    with open(static.path, 'wb') as file:
+        file.write(b'changed')
+    stat = os.stat(static.path)
+    os.utime(static.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    static.update()
+
+    new_etag, data = asyncio.run(static.variant('gzip', cache))
+    assert new_etag != etag
+    assert gzip.decompress(data) == b'changed'
+
+
+def test_variants_bounded(static):
+    cache = StaticCache(1100, revalidate=0)
+    _, data = asyncio.run(static.variant('gzip', cache))
+    assert cache.bytes == len(data)
+    assert cache.evictions > 0
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('If-None-Match', True),
+    ('If-None-Match', False),
+    ('If-Modified-Since', True),
+    ('If-Modified-Since', False)
+])
+def test_not_modified(static, header, expected):
+    if header == 'If-None-Match':
+        value = static.etag if expected else '"other"'
+    else:
+        value = (static.last_modified if expected
+                 else 'Thu, 01 Jan 1970 00:00:00 GMT')
+    assert static.not_modified(Headers({header: value})) is expected
+
+
+def test_not_modified_variant_etag(static):
+    etag = static.get_headers('gzip')['ETag']
+    assert static.not_modified(Headers({'If-None-Match': f'W/{etag}'}))
+
+
+def test_not_modified_response(static):
+    response = static.not_modified_response()
+    assert response.status_code == 304
+    assert response.headers['etag'] == static.etag
+    assert 'content-type' not in response.headers
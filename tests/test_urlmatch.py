@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+
+from web.core.urlmatch import (
+    converters,
+    parse_var,
+    split_path
+)
+
+UUID = '0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0'
+
+
+def test_int():
+    assert converters['int'].to_python('42') == 42
+
+
+@pytest.mark.parametrize('value', ['-1', '+1', '٣', '1.0', ''])
+def test_int_rejects(value):
+    with pytest.raises(ValueError):
+        converters['int'].to_python(value)
+
+
+def test_uuid():
+    assert converters['uuid'].to_python(UUID) == uuid.UUID(UUID)
+
+
+@pytest.mark.parametrize('value', [
+    UUID.upper(),
+    UUID.replace('-', '') + '----',
+    '{' + UUID[:-2] + '}',
+    'urn:uuid:' + UUID[:27],
+    UUID + '0'
+])
+def test_uuid_rejects_non_canonical(value):
+    with pytest.raises(ValueError):
+        converters['uuid'].to_python(value)
+
+
+def test_slug():
+    assert converters['slug'].to_python('a-b_1') == 'a-b_1'
+    with pytest.raises(ValueError):
+        converters['slug'].to_python('a b')
+
+
+def test_parse_var():
+    assert parse_var('<int:pk>') == (converters['int'], 'pk')
+    assert parse_var('<name>') == (converters['str'], 'name')
+    assert parse_var('name') is None
+
+
+def test_split_path():
+    assert split_path('/') == []
+    assert split_path('/a/b/') == ['a', 'b']
@@ -0,0 +1,111 @@
+import asyncio
+import gc
+import gzip
+import os
+
+import pytest
+
+from web.core import Settings
+from web.core import watcher as watcher_module
+from web.core.watcher import StaticWatcher
+
+
+def rewrite(path, content):
+    stat = os.stat(path)
+    path.write_bytes(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def published():
+    return []
+
+
+@pytest.fixture
+def watcher(tmp_path, published):
+    (tmp_path / 'app.js').write_bytes(b'one')
+    watcher = StaticWatcher(
+        lambda statics, manifest: published.append((statics, manifest)),
+        fingerprint=True
+    )
+    watcher.add_tree('/static/', str(tmp_path), {})
+    watcher.flush()
+    return watcher
+
+
+def test_publish_once(watcher, published):
+    assert len(published) == 1
+    statics, manifest = published[0]
+    assert manifest['/static/app.js/'] in statics
+    assert statics is not watcher.statics
+
+    watcher.poll_once()
+    assert len(published) == 1
+
+
+def test_rewrite_publishes_new_mapping(tmp_path, watcher, published):
+    statics, manifest = published[0]
+    static = statics['/static/app.js/']
+    etag = static.etag
+
+    rewrite(tmp_path / 'app.js', b'two')
+    watcher.poll_once()
+
+    assert len(published) == 2
+    assert static.etag == etag
+    assert statics['/static/app.js/'] is static
+
+    new_statics, new_manifest = published[1]
+    assert new_statics['/static/app.js/'].etag != etag
+    assert new_manifest['/static/app.js/'] != manifest['/static/app.js/']
+    assert manifest['/static/app.js/'] not in new_statics
+
+
+def test_removed_file(tmp_path, watcher, published):
+    os.remove(tmp_path / 'app.js')
+    stat = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    watcher.poll_once()
+
+    assert published[-1] == ({}, {})
+
+
+def test_touch_keeps_fingerprinted_url(tmp_path, watcher, published):
+    _, manifest = published[0]
+    rewrite(tmp_path / 'app.js', b'one')
+    watcher.poll_once()
+
+    statics, new_manifest = published[-1]
+    url = manifest['/static/app.js/']
+    assert new_manifest['/static/app.js/'] == url
+    assert statics[url].etag == statics['/static/app.js/'].etag
+
+
+def test_watch_disabled_by_default():
+    assert Settings().STATIC_WATCH is False
+
+
+def test_forked_resets_live_watchers(watcher):
+    watcher.thread = object()
+    watcher_module.forked()
+    assert watcher.thread is None
+    assert watcher in watcher_module.watchers
+
+
+def test_watchers_are_weak(published):
+    StaticWatcher(published.append)
+    gc.collect()
+    assert all(watcher.publish != published.append
+               for watcher in watcher_module.watchers)
+
+
+def test_refresh_keeps_precompressed(tmp_path, watcher, published):
+    statics, _ = published[0]
+    statics['/static/app.js/'].precompress()
+    rewrite(tmp_path / 'app.js', b'two')
+    watcher.poll_once()
+
+    static = published[-1][0]['/static/app.js/']
+    etag, data = asyncio.run(static.variant('gzip'))
+    assert gzip.decompress(data) == b'two'
+    assert static.variants['gzip'] == (etag, data)
@@ -1,9 +1,11 @@
 from .settings import *
 from .app import *
 from .urlmatch import *
+from .router import *
 
 __all__ = [
     *settings.__all__,
     *app.__all__,
-    *urlmatch.__all__
+    *urlmatch.__all__,
+    *router.__all__
 ]
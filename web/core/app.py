@@ -2,6 +2,7 @@ __all__ = [
     'matching',
     'get_app',
     'not_found',
+    'method_not_allowed',
     'App'
 ]
 
@@ -24,7 +25,9 @@ from typing import (
 from web.http import (
     HttpRequest,
     HttpResponse,
+    FileResponse,
     HTTP_STATUS_404,
+    HTTP_STATUS_405,
     HTTP_STATUS_301,
     HTTP_STATUS_500,
     HttpStatusType
@@ -38,18 +41,24 @@ from web.core.uvc import (
     uvicorn_response,
     uvc_exc
 )
-from web.core.application import (
-    Application,
-    View
-)
+from web.core.application import View
 from web.utils import (
     lunch_trace,
     to_correct,
-    merge_url,
-    request_trace,
-    ascii_quote
+    request_trace
+)
+from web.core.statics import (
+    Static,
+    StaticCache
+)
+from web.core.executor import (
+    IOExecutor,
+    run_io
+)
+from web.core.router import (
+    RouteCache,
+    Resolved
 )
-from web.core.statics import Static
 from web.core.urlmatch import pattern_matching
 from web.server import run_server
 from web.core import Settings
@@ -63,6 +72,8 @@ UvicornReceiveMethod = Callable[
     Coroutine[Any, Any, LifespanReceiveMessage]
 ]
 
+STREAM_CHUNK_SIZE = 65536
+
 T = Union[bytes, None, NoReturn]
 CT = Callable[..., Coroutine[None, None, T]]
 
@@ -175,24 +186,30 @@ class Asgi:
         return body
 
     @staticmethod
-    def uvicorn_response(response: HttpResponse) -> Sequence[dict]:
+    def uvicorn_response(
+            response: HttpResponse,
+            body: bool = True
+    ) -> Sequence[dict]:
         """
         Generates a http response from
         an HttpResponse object that is
         understandable to the uvicorn server.
+        The body is omitted if body=False.
         """
         return [
             {
                 'type': 'http.response.start',
                 'status': response.status_code,
-                'headers': (
-                    (ascii_quote(key), ascii_quote(value))
-                    for key, value in response.headers
-                ),
+                'headers': response.get_headers(),
             },
             {
                 'type': 'http.response.body',
-                'body': response.body,
+                'body': (
+                    b'' if not body
+                    else response.read()
+                    if isinstance(response, FileResponse)
+                    else response.body
+                ),
             }
         ]
 
@@ -208,18 +225,84 @@ class Asgi:
         the http request, starting the
         router and returning a http response.
         """
-        view, response = await (
-            self.app.routing(
-                HttpRequest(
-                    scope,
-                    await self.get_body(receive)
-                )
-            )
+        request = HttpRequest(
+            scope,
+            await self.get_body(receive)
         )
+        view, response = await self.app.routing(request)
         if not check_response(response):
             response = not_found()
 
-        await uvicorn_response(self.uvicorn_response(response), send)
+        body = request.method != request.METHOD_HEAD
+        if body and isinstance(response, FileResponse):
+            return await self.send_file(response, scope, send)
+
+        await uvicorn_response(
+            self.uvicorn_response(response, body=body), send)
+
+    async def send_file(
+            self,
+            response: FileResponse,
+            scope: dict,
+            send: UvicornSendMethod
+    ) -> None:
+        """
+        Sends the whole file with the http.response.pathsend
+        extension if the server supports it, otherwise
+        streams the parts in chunks of STREAM_CHUNK_SIZE with
+        more_body, so a download holds one chunk in memory.
+        The file is opened before the response is started,
+        a file removed in the meantime is answered with 404.
+        """
+        executor = self.app.io_executor
+        try:
+            file = await run_io(executor, open, response.path, 'rb')
+        except FileNotFoundError:
+            return await uvicorn_response(
+                self.uvicorn_response(not_found()), send)
+
+        with file:
+            start, _ = self.uvicorn_response(response, body=False)
+            await send(start)
+            if ('http.response.pathsend' in (scope.get('extensions') or {})
+                    and response.whole):
+                return await send({
+                    'type': 'http.response.pathsend',
+                    'path': response.path
+                })
+
+            for part in response.parts:
+                if isinstance(part, bytes):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': part,
+                        'more_body': True
+                    })
+                    continue
+
+                offset, remaining = part
+                file.seek(offset)
+                while remaining > 0:
+                    chunk = await run_io(
+                        executor,
+                        file.read,
+                        min(STREAM_CHUNK_SIZE, remaining)
+                    )
+                    if not chunk:
+                        break
+
+                    remaining -= len(chunk)
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True
+                    })
+
+        await send({
+            'type': 'http.response.body',
+            'body': b'',
+            'more_body': False
+        })
 
     async def __call__(
             self,
@@ -248,7 +331,10 @@ class App:
     __slots__ = (
         'send',
         'settings',
-        'server_type'
+        'server_type',
+        'route_cache',
+        'static_cache',
+        'io_executor'
     )
 
     instance = None
@@ -256,11 +342,37 @@ class App:
     send: Union[UvicornSendMethod, None]
     settings: Settings
     server_type: str
+    route_cache: Union[RouteCache, None]
+    static_cache: Union[StaticCache, None]
+    io_executor: Union[IOExecutor, None]
 
     def __init__(self, settings: Settings) -> None:
         self.send = None
         self.settings = settings
         self.server_type = 'std'
+        self.route_cache = (
+            RouteCache(
+                settings.ROUTE_CACHE_SIZE,
+                settings.ROUTE_CACHE_404_SIZE
+            )
+            if settings.ROUTE_CACHE_SIZE else None
+        )
+        self.static_cache = (
+            StaticCache(
+                settings.STATIC_CACHE_BYTES,
+                settings.STATIC_CACHE_REVALIDATE
+            )
+            if settings.STATIC_CACHE_BYTES else None
+        )
+        self.io_executor = (
+            IOExecutor(
+                settings.STATIC_IO_WORKERS,
+                settings.STATIC_IO_QUEUE_SIZE
+            )
+            if settings.STATIC_IO_WORKERS else None
+        )
+        if settings.STATIC_PRECOMPRESS:
+            self.precompress()
 
         self.init()
 
@@ -270,6 +382,27 @@ class App:
         """
         App.instance = self
 
+    def precompress(self) -> None:
+        """
+        Compresses the compressible statics before the server
+        starts, so the variants are shared by the forked
+        workers and are never evicted. The rest is compressed
+        on the first request of each of them.
+        """
+        statics = self.settings.statics
+        aliases = set(self.settings.static_manifest.values())
+        for url, static in statics.items():
+            if static.gzip_compression and url not in aliases:
+                static.precompress(
+                    self.static_cache,
+                    self.settings.STATIC_COMPRESS_MIN_SIZE
+                )
+
+        # the fingerprinted urls share the variants of the files.
+        for url, alias in self.settings.static_manifest.items():
+            if (static := statics.get(url)) and alias in statics:
+                statics[alias].variants = static.variants
+
     def run(self):
         """
         Displays tracing information about
@@ -298,8 +431,7 @@ class App:
                 HttpResponse(
                     status=HTTP_STATUS_301,
                     headers={
-                        'Location': f'{request.path}/',
-                        'Connection': 'close'
+                        'Location': f'{request.path}/'
                     }
                 )
             )
@@ -310,76 +442,99 @@ class App:
             self,
             request: HttpRequest
     ) -> Union[HttpResponse, None]:
+        """
+        Returns the response of the static file at
+        the path of the request, a conditional request
+        matching the validators of the file is answered
+        with 304 before the file is read, a GET request
+        with the Range header with 206 or 416.
+        """
+        if self.settings.static_watcher is not None:
+            self.settings.static_watcher.start()
+
         static: Union[Static, None] = (
             self.settings.statics.get(
                 to_correct(request.path)
             )
         )
-        if static:
-            return await static.get_http_response()
+        if not static:
+            return None
 
-        return None
+        try:
+            await static.revalidate(
+                self.settings.STATIC_CACHE_REVALIDATE, self.io_executor)
+        except FileNotFoundError:
+            return None
 
-    @staticmethod
-    async def traversal_by_urlpatterns(
-            root_url: str,
-            app: Application,
-            request: HttpRequest
-    ) -> tuple[Union[View, None], HttpResponse]:
+        if (request.method in (request.METHOD_GET, request.METHOD_HEAD)
+                and static.not_modified(request.headers)):
+            return static.not_modified_response()
+
+        if (request.method == request.METHOD_GET
+                and (response := static.get_range_response(
+                    request.headers))):
+            return response
+
+        try:
+            return await static.get_http_response(
+                request.headers.get('accept-encoding'),
+                self.static_cache,
+                self.settings.STATIC_COMPRESS_MIN_SIZE,
+                self.io_executor
+            )
+        except FileNotFoundError:
+            return None
+
+    def resolve(self, path: str) -> Union[Resolved, None]:
         """
-        Walk through the urlpatterns specified by
-        the user in the urls file of the application
-        created by him and, if the url address matches
-        the pattern, launches the user-created view,
-        passing it the HttpRequest object and returns
-        HttpResponse and the presentation itself to the caller.
+        Resolves the path with the router,
+        through the route cache if it is enabled.
         """
-        for url, view in app:
-            url, variables = matching(
-                merge_url(root_url, to_correct(url)),
-                request.path
-            )
-            if variables or request.path == url:
-                response = await view(request, **variables)
-                return (
-                    view,
-                    not_found() if not check_response(response) else response
-                )
+        if self.route_cache is not None:
+            return self.route_cache.resolve(
+                self.settings.router, path)
 
-        return None, not_found()
+        return self.settings.router.resolve(path)
 
     async def routing(
             self,
             request: HttpRequest
     ) -> tuple[Union[View, None], HttpResponse]:
         """
-        Iterates through ROOT_URLPATTERNS
-        and runs the method "App.traversal_by_urlpatterns"
-        to check if the url matches.
+        Resolves the url with the router compiled
+        from ROOT_URLPATTERNS, launches the view,
+        passing it the HttpRequest object and returns
+        HttpResponse and the view itself to the caller.
+        A url without a trailing "/" is handled
+        according to the TRAILING_SLASH setting.
         """
         request_trace(request, self)
         if static := await self.get_static(request):
             return None, static
 
-        if redirection := self.redirection(request):
-            return None, redirection
-
-        for root_url, app_name in self.settings.ROOT_URLPATTERNS:
-            app: Union[Application, None] = (
-                self
-                .settings
-                .applications
-                .get(app_name)
+        path = request.path
+        if not path.endswith('/'):
+            path = f'{path}/'
+            match self.settings.TRAILING_SLASH:
+                case 'strict':
+                    return None, not_found()
+                case 'redirect':
+                    if self.resolve(path):
+                        return None, self.redirection(request)
+
+                    return None, not_found()
+
+        if resolved := self.resolve(path):
+            endpoint, values = resolved
+            if not (target := endpoint.get(request.method)):
+                return None, method_not_allowed(endpoint.allow)
+
+            view, names = target
+            response = await view(request, **dict(zip(names, values)))
+            return (
+                view,
+                not_found() if not check_response(response) else response
             )
-            if app:
-                view, response = (
-                    await self.traversal_by_urlpatterns(
-                        to_correct(root_url),
-                        app, request
-                    )
-                )
-                if view:
-                    return view, response
 
         return None, not_found()
 
@@ -420,28 +575,56 @@ def not_found() -> HttpResponse:
     )
 
 
+def method_not_allowed(allow: str) -> HttpResponse:
+    """
+    Returns HttpResponse method not allowed
+    with the methods supported by the url.
+    """
+    return (
+        HttpResponse(
+            status=HTTP_STATUS_405,
+            body=HTTP_STATUS_405[1].encode(),
+            headers={
+                'Content-Type': 'text/plain',
+                'Allow': allow
+            }
+        )
+    )
+
+
 @exc_handler
 async def _run(
         app: App,
         request: bytes,
-        client: tuple
-) -> bytes:
+        client: tuple,
+        keep_alive: bool = False
+) -> Union[bytes, FileResponse]:
     """
     A function passed to the server as an entry point.
     It is responsible for starting routing
     and returning a http response to the server.
+    keep_alive tells whether the server keeps
+    the connection open after the response.
+    A FileResponse is returned as is, so that
+    the server can send its file with sendfile.
 
     Note:
         Used when the server built
         into the framework is launched.
     """
-    view, response = await app.routing(
-        HttpRequest({
-            'client': client
-        }).set_http(request)
-    )
+    http_request = HttpRequest({
+        'client': client
+    }).set_http(request)
+    view, response = await app.routing(http_request)
     if isinstance(response, HttpResponse):
-        return response.as_http()
+        response.headers['Connection'] = (
+            'keep-alive' if keep_alive else 'close'
+        )
+        body = http_request.method != http_request.METHOD_HEAD
+        if body and isinstance(response, FileResponse):
+            return response
+
+        return response.as_http(body=body)
     else:
         raise InvalidReturnType(
             str(HttpResponse), view.__name__)
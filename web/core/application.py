@@ -1,33 +1,80 @@
 __all__ = [
     'Application',
+    'Route',
     'View'
 ]
 
 from typing import (
     Callable,
     Sequence,
-    Coroutine
+    Coroutine,
+    NamedTuple,
+    Union
 )
 from web.http import HttpResponse
+from web.utils import to_correct
+from web.core.urlmatch import split_path
 
 View = Callable[
     ...,
     Coroutine[None, None, HttpResponse]
 ]
+UrlPattern = Union[
+    tuple[str, View],
+    tuple[str, View, Union[str, Sequence[str]]]
+]
+
+
+class Route(NamedTuple):
+    """
+    Normalized url pattern split
+    into catalogs at install time.
+    Empty methods mean any http method.
+    """
+    url: str
+    catalogs: tuple[str, ...]
+    view: View
+    methods: tuple[str, ...]
+
+    @classmethod
+    def from_pattern(
+            cls,
+            url: str,
+            view: View,
+            methods: Union[str, Sequence[str]] = ()
+    ) -> 'Route':
+        """
+        Returns Route of the url pattern, a str
+        in place of methods is a single method.
+        """
+        if isinstance(methods, str):
+            methods = (methods,)
+
+        url = to_correct(url)
+        return cls(
+            url,
+            tuple(split_path(url)),
+            view,
+            tuple(method.upper() for method in methods)
+        )
 
 
 class Application:
     def __init__(
             self,
             name: str,
-            urlpatterns: Sequence[tuple[str, View]]
+            urlpatterns: Sequence[UrlPattern]
     ) -> None:
         self.name = name
         self.urlpatterns = urlpatterns
+        self.routes: tuple[Route, ...] = tuple(
+            Route.from_pattern(*pattern)
+            for pattern in urlpatterns
+        )
 
     def __repr__(self):
         return f'<{self.__class__.__name__} {self.name}>'
 
     def __iter__(self):
-        for url, view in self.urlpatterns:
-            yield url, view
+        for route in self.routes:
+            yield route.url, route.view
@@ -0,0 +1,148 @@
+__all__ = [
+    'IDENTITY',
+    'encoders',
+    'compressible',
+    'parse_accept_encoding',
+    'negotiate'
+]
+
+import gzip
+
+from typing import (
+    Callable,
+    Iterable,
+    Union
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    # Python 3.14+
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+Encoder = Callable[[bytes], bytes]
+
+IDENTITY = 'identity'
+
+# the order in which the encodings are chosen
+# when the client accepts them equally.
+PREFERENCE = (
+    'br',
+    'zstd',
+    'gzip'
+)
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+ZSTD_LEVEL = 19
+
+# content types whose data is already compressed.
+COMPRESSED_TYPES = (
+    'image/',
+    'audio/',
+    'video/',
+    'font/woff',
+    'application/zip',
+    'application/gzip',
+    'application/x-bzip',
+    'application/x-7z-compressed',
+    'application/vnd.rar',
+    'application/pdf',
+    'application/epub+zip',
+    'application/java-archive'
+)
+
+
+def gzip_compress(data: bytes) -> bytes:
+    # mtime=0 keeps the output the same for the same data.
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+encoders: dict[str, Encoder] = {
+    'gzip': gzip_compress
+}
+
+if brotli is not None:
+    encoders['br'] = lambda data: brotli.compress(
+        data, quality=BROTLI_QUALITY)
+
+if zstd is not None:
+    encoders['zstd'] = lambda data: zstd.compress(data, ZSTD_LEVEL)
+
+
+def compressible(content_type: Union[str, None]) -> bool:
+    """
+    Returns False for the content
+    types that are already compressed.
+    """
+    if not content_type:
+        return True
+
+    if content_type == 'image/svg+xml':
+        return True
+
+    return not content_type.startswith(COMPRESSED_TYPES)
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """
+    Parses the Accept-Encoding header into
+    a dictionary of the codings and their qvalues.
+    """
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        if not (coding := coding.strip().lower()):
+            continue
+
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        qualities[coding] = quality
+
+    return qualities
+
+
+def negotiate(
+        accept_encoding: Union[str, None],
+        available: Iterable[str] = encoders
+) -> Union[str, None]:
+    """
+    Returns the available encoding with the highest
+    qvalue in the Accept-Encoding header, identity
+    is ranked with them and wins only with a higher
+    qvalue. Identity is acceptable unless it is
+    excluded by identity;q=0 or by *;q=0 without
+    identity, then None is returned if no other
+    encoding is acceptable.
+    """
+    if not accept_encoding:
+        return IDENTITY
+
+    qualities = parse_accept_encoding(accept_encoding)
+    default = qualities.get('*', 0.0)
+    encoding, best = None, 0.0
+    for coding in PREFERENCE:
+        if coding in available:
+            if (quality := qualities.get(coding, default)) > best:
+                encoding, best = coding, quality
+
+    identity = qualities.get(IDENTITY, qualities.get('*', 1.0))
+    if identity > best:
+        return IDENTITY
+
+    return encoding
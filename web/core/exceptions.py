@@ -4,7 +4,9 @@ __all__ = [
     'ApplicationNotInit',
     'InvalidReturnType',
     'StaticNotFound',
-    'ServerTypeError'
+    'ServerTypeError',
+    'InvalidUrlPattern',
+    'InvalidSetting'
 ]
 
 
@@ -58,3 +60,18 @@ class ServerTypeError(Exception):
             f"Wrong server type {server_type}. "
             f"Only available 'uvicorn' and 'std'."
         )
+
+
+class InvalidUrlPattern(Exception):
+    def __init__(self, pattern, reason):
+        super().__init__(
+            f"Invalid url pattern '{pattern}': {reason}."
+        )
+
+
+class InvalidSetting(Exception):
+    def __init__(self, name, value, choices):
+        super().__init__(
+            f"Invalid value {value!r} of the setting {name}, "
+            f"available: {', '.join(map(repr, choices))}."
+        )
@@ -0,0 +1,131 @@
+__all__ = [
+    'IOExecutor',
+    'run_io'
+]
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    TypeVar,
+    Union,
+    Any
+)
+
+T = TypeVar('T')
+
+
+class IOExecutor:
+    """
+    Bounded thread pool for blocking file I/O.
+    At most workers + queue_size calls are submitted
+    to the pool at once, the callers over the limit
+    wait for a free slot, so a saturated pool slows
+    down the requests instead of queueing them endlessly.
+    A slot is held until the call has finished in its
+    thread, even if the awaiting task is cancelled.
+    """
+    __slots__ = (
+        'workers',
+        'queue_size',
+        'pool',
+        'slots',
+        'waiting',
+        'running',
+        'calls',
+        'max_queue_depth'
+    )
+
+    workers: int
+    queue_size: int
+    pool: ThreadPoolExecutor
+    slots: asyncio.Semaphore
+    waiting: int
+    running: int
+    calls: int
+    max_queue_depth: int
+
+    def __init__(
+            self,
+            workers: int,
+            queue_size: int = 0
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pool = ThreadPoolExecutor(
+            workers, thread_name_prefix='web-io')
+        self.slots = asyncio.Semaphore(workers + queue_size)
+        self.waiting = 0
+        self.running = 0
+        self.calls = 0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of the calls that wait
+        for a thread of the pool.
+        """
+        return self.waiting + max(self.running - self.workers, 0)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Runs fn(*args) in the pool once
+        a slot is free and returns its result.
+        """
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        self.running += 1
+        self.calls += 1
+        try:
+            future = self.pool.submit(fn, *args)
+        except BaseException:
+            self.release()
+            raise
+
+        future.add_done_callback(lambda _: self.finished(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def finished(self, loop: asyncio.AbstractEventLoop) -> None:
+        # called in the thread of the pool.
+        try:
+            loop.call_soon_threadsafe(self.release)
+        except RuntimeError:
+            # the loop is closed.
+            pass
+
+    def release(self) -> None:
+        self.running -= 1
+        self.slots.release()
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False)
+
+    def __repr__(self) -> str:
+        return (
+            f'<{self.__class__.__name__} '
+            f'workers={self.workers} running={self.running} '
+            f'queue_depth={self.queue_depth} calls={self.calls}>'
+        )
+
+
+async def run_io(
+        executor: Union[IOExecutor, None],
+        fn: Callable[..., T],
+        *args: Any
+) -> T:
+    """
+    Runs fn(*args) in the executor,
+    or in place if there is none.
+    """
+    if executor is None:
+        return fn(*args)
+
+    return await executor.run(fn, *args)
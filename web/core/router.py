@@ -0,0 +1,332 @@
+__all__ = [
+    'Endpoint',
+    'Node',
+    'Router',
+    'RouteCache'
+]
+
+from collections import OrderedDict
+from typing import (
+    Sequence,
+    Union,
+    Any
+)
+from web.core.application import View
+from web.core.exceptions import InvalidUrlPattern
+from web.core.urlmatch import (
+    Converter,
+    split_path,
+    parse_var
+)
+from web.utils import to_correct
+
+Resolved = tuple['Endpoint', tuple[Any, ...]]
+Target = tuple[View, tuple[str, ...]]
+
+ANY_METHOD = '*'
+
+
+class Endpoint:
+    """
+    Per-method dispatch table of the url pattern.
+    Keeps the view together with the names of its
+    variables and the precomputed Allow header.
+    """
+    __slots__ = (
+        'views',
+        'allow'
+    )
+
+    views: dict[str, Target]
+    allow: str
+
+    def __init__(self) -> None:
+        self.views = {}
+        self.allow = ''
+
+    def add(
+            self,
+            methods: Sequence[str],
+            view: View,
+            names: tuple[str, ...]
+    ) -> None:
+        """
+        Registers the view for the methods, the
+        first registered view of the method is kept.
+        """
+        for method in methods or (ANY_METHOD,):
+            self.views.setdefault(method, (view, names))
+
+        allow = set(self.views)
+        if 'GET' in allow:
+            allow.add('HEAD')
+
+        self.allow = ', '.join(sorted(allow - {ANY_METHOD}))
+
+    def get(self, method: str) -> Union[Target, None]:
+        """
+        Returns the view for the method, HEAD
+        falls back to GET, then any method.
+        """
+        if target := self.views.get(method):
+            return target
+
+        if method == 'HEAD' and (target := self.views.get('GET')):
+            return target
+
+        return self.views.get(ANY_METHOD)
+
+
+class Node:
+    """
+    Trie node, holds static children by
+    catalog name and one variable child
+    per converter, ordered by priority.
+    """
+    __slots__ = (
+        'static',
+        'variables',
+        'endpoint'
+    )
+
+    static: dict[str, 'Node']
+    variables: list[tuple[Converter, 'Node']]
+    endpoint: Union[Endpoint, None]
+
+    def __init__(self) -> None:
+        self.static = {}
+        self.variables = []
+        self.endpoint = None
+
+    def variable(self, converter: Converter) -> 'Node':
+        """
+        Returns the variable child for
+        the converter, creating it if necessary.
+        """
+        for _converter, child in self.variables:
+            if _converter is converter:
+                return child
+
+        child = Node()
+        self.variables.append((converter, child))
+        self.variables.sort(key=lambda item: item[0].priority)
+        return child
+
+    def match(
+            self,
+            catalogs: list[str],
+            index: int,
+            values: list[Any]
+    ) -> Union['Node', None]:
+        """
+        Walks down the trie, static children
+        take precedence over the variable ones.
+        Collects the converted values of the
+        variables in the order in which they occur.
+        """
+        if index == len(catalogs):
+            return self if self.endpoint is not None else None
+
+        catalog = catalogs[index]
+        if child := self.static.get(catalog):
+            if node := child.match(catalogs, index + 1, values):
+                return node
+
+        if not catalog:
+            return None
+
+        for converter, child in self.variables:
+            if converter.greedy:
+                value, end = '/'.join(catalogs[index:]), len(catalogs)
+            else:
+                value, end = catalog, index + 1
+
+            try:
+                values.append(converter.to_python(value))
+            except ValueError:
+                continue
+
+            if node := child.match(catalogs, end, values):
+                return node
+
+            values.pop()
+
+        return None
+
+
+class Router:
+    """
+    Segment trie compiled once from
+    ROOT_URLPATTERNS, the lookup depends only
+    on the path depth and not on the number
+    of registered urlpatterns.
+    """
+    __slots__ = (
+        'root',
+    )
+
+    root: Node
+
+    def __init__(self) -> None:
+        self.root = Node()
+
+    def add(
+            self,
+            catalogs: Sequence[str],
+            view: View,
+            methods: Sequence[str] = ()
+    ) -> None:
+        """
+        Adds the catalogs of the url pattern
+        to the trie and registers the view for the
+        methods, empty methods mean any method.
+        """
+        node = self.root
+        names = []
+        for index, catalog in enumerate(catalogs):
+            if var := parse_var(catalog):
+                converter, var_name = var
+                if not var_name:
+                    raise InvalidUrlPattern(
+                        '/'.join(catalogs), 'variable without a name')
+
+                if converter.greedy and index != len(catalogs) - 1:
+                    raise InvalidUrlPattern(
+                        '/'.join(catalogs),
+                        f"'{converter.name}' must be the last catalog"
+                    )
+
+                names.append(var_name)
+                node = node.variable(converter)
+            else:
+                node = node.static.setdefault(catalog, Node())
+
+        if node.endpoint is None:
+            node.endpoint = Endpoint()
+
+        node.endpoint.add(methods, view, tuple(names))
+
+    def resolve(self, path: str) -> Union[Resolved, None]:
+        """
+        Returns the endpoint and the converted values
+        of the variables, or None if nothing matches.
+        """
+        values = []
+        node = self.root.match(split_path(path), 0, values)
+        if node is None:
+            return None
+
+        return node.endpoint, tuple(values)
+
+    @classmethod
+    def from_settings(cls, settings) -> 'Router':
+        """
+        Compiles the router from the ROOT_URLPATTERNS
+        and the route tables of installed applications.
+        """
+        router = cls()
+        for root_url, app_name in settings.ROOT_URLPATTERNS:
+            app = settings.applications.get(app_name)
+            if app:
+                root = tuple(split_path(to_correct(root_url)))
+                for route in app.routes:
+                    router.add(
+                        root + route.catalogs,
+                        route.view,
+                        route.methods
+                    )
+
+        return router
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of resolved endpoints keyed
+    by the request path. Paths that did not match
+    are kept separately with their own smaller cap,
+    so random urls do not evict the hot entries.
+    """
+    __slots__ = (
+        'size',
+        'negative_size',
+        'hits',
+        'misses',
+        'negative_hits',
+        'found',
+        'not_found'
+    )
+
+    size: int
+    negative_size: int
+    hits: int
+    misses: int
+    negative_hits: int
+    found: OrderedDict[str, Resolved]
+    not_found: OrderedDict[str, None]
+
+    def __init__(
+            self,
+            size: int,
+            negative_size: int = 0
+    ) -> None:
+        self.size = size
+        self.negative_size = negative_size
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.found = OrderedDict()
+        self.not_found = OrderedDict()
+
+    @staticmethod
+    def put(
+            cache: OrderedDict,
+            size: int,
+            path: str,
+            value: Union[Resolved, None]
+    ) -> None:
+        if size <= 0:
+            return None
+
+        cache[path] = value
+        if len(cache) > size:
+            cache.popitem(last=False)
+
+    def resolve(
+            self,
+            router: Router,
+            path: str
+    ) -> Union[Resolved, None]:
+        """
+        Returns the cached route for the path,
+        on a miss resolves it with the router
+        and remembers the result.
+        """
+        if (resolved := self.found.get(path)) is not None:
+            self.found.move_to_end(path)
+            self.hits += 1
+            return resolved
+
+        if path in self.not_found:
+            self.not_found.move_to_end(path)
+            self.hits += 1
+            self.negative_hits += 1
+            return None
+
+        self.misses += 1
+        if (resolved := router.resolve(path)) is not None:
+            self.put(self.found, self.size, path, resolved)
+        else:
+            self.put(self.not_found, self.negative_size, path, None)
+
+        return resolved
+
+    def clear(self) -> None:
+        self.found.clear()
+        self.not_found.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f'<{self.__class__.__name__} '
+            f'hits={self.hits} misses={self.misses} '
+            f'negative_hits={self.negative_hits}>'
+        )
@@ -2,9 +2,27 @@ __all__ = [
     'Settings'
 ]
 
+from typing import Union
+
 from web.core.application import Application
-from web.core.exceptions import ApplicationNotFound
+from web.core.exceptions import (
+    ApplicationNotFound,
+    InvalidSetting
+)
 from web.core.statics import Static
+from web.core.watcher import StaticWatcher
+from web.core.router import Router
+from web.server.loops import EVENT_LOOPS
+
+TRAILING_SLASH_POLICIES = (
+    'redirect',
+    'strict',
+    'ignore'
+)
+SERVER_ENGINES = (
+    'socket',
+    'protocol'
+)
 
 
 class Settings:
@@ -17,40 +35,129 @@ class Settings:
         'TRACING',
         'SERVER_HOST',
         'SERVER_PORT',
+        'SERVER_ENGINE',
+        'WORKERS',
+        'EVENT_LOOP',
+        'MAX_CONNECTIONS',
+        'SHUTDOWN_TIMEOUT',
+        'KEEP_ALIVE_TIMEOUT',
+        'HEADER_READ_TIMEOUT',
+        'BODY_READ_TIMEOUT',
+        'MAX_BODY_SIZE',
         'INSTALL_APPS',
         'STATIC_FILE_DIRS',
         'ROOT_URLPATTERNS',
         'STOP_ON_EXCEPTION',
         'APP_NAME',
+        'ROUTE_CACHE_SIZE',
+        'ROUTE_CACHE_404_SIZE',
+        'TRAILING_SLASH',
+        'STATIC_CACHE_BYTES',
+        'STATIC_CACHE_REVALIDATE',
+        'STATIC_PRECOMPRESS',
+        'STATIC_COMPRESS_MIN_SIZE',
+        'STATIC_IO_WORKERS',
+        'STATIC_IO_QUEUE_SIZE',
+        'STATIC_WATCH',
+        'STATIC_WATCH_INTERVAL',
+        'STATIC_FINGERPRINT',
         'statics',
-        'applications'
+        'static_watcher',
+        'static_manifest',
+        'applications',
+        'router'
     )
 
     statics: dict[str, Static]
+    static_watcher: Union[StaticWatcher, None]
+    static_manifest: dict[str, str]
     applications: dict[str, Application]
+    router: Router
 
     def __init__(self):
         self.DEBUG = True
         self.TRACING = True
         self.SERVER_HOST = 'localhost'
         self.SERVER_PORT = 8000
+        self.SERVER_ENGINE = 'socket'
+        self.WORKERS = 1
+        self.EVENT_LOOP = 'asyncio'
+        self.MAX_CONNECTIONS = 0
+        self.SHUTDOWN_TIMEOUT = 10
+        self.KEEP_ALIVE_TIMEOUT = 5
+        self.HEADER_READ_TIMEOUT = 10
+        self.BODY_READ_TIMEOUT = 30
+        self.MAX_BODY_SIZE = 10 * 1024 * 1024
         self.INSTALL_APPS = []
         self.STATIC_FILE_DIRS = {}
         self.ROOT_URLPATTERNS = []
         self.STOP_ON_EXCEPTION = True
         self.APP_NAME = None
+        self.ROUTE_CACHE_SIZE = 1024
+        self.ROUTE_CACHE_404_SIZE = 128
+        self.TRAILING_SLASH = 'redirect'
+        self.STATIC_CACHE_BYTES = 32 * 1024 * 1024
+        self.STATIC_CACHE_REVALIDATE = 1.0
+        self.STATIC_PRECOMPRESS = False
+        self.STATIC_COMPRESS_MIN_SIZE = 1024
+        self.STATIC_IO_WORKERS = 4
+        self.STATIC_IO_QUEUE_SIZE = 64
+        self.STATIC_WATCH = False
+        self.STATIC_WATCH_INTERVAL = 1.0
+        self.STATIC_FINGERPRINT = False
 
         self.statics = {}
+        self.static_watcher = None
+        self.static_manifest = {}
         self.applications = {}
+        self.router = Router()
 
     def install_app(self, app: Application) -> None:
         self.applications[app.name] = app
 
+    def set_statics(
+            self,
+            statics: dict[str, Static],
+            manifest: dict[str, str]
+    ) -> None:
+        """
+        Replaces the statics index and the manifest with
+        new mappings, each one is swapped in a single
+        assignment and never changed afterwards, so a
+        request sees either the old or the new index.
+        The statics go first: every url of the new
+        manifest is already served.
+        """
+        self.statics = statics
+        self.static_manifest = manifest
+
     def check(self):
         for url, app_name in self.ROOT_URLPATTERNS:
             if app_name not in self.INSTALL_APPS:
                 raise ApplicationNotFound(app_name)
 
+        if self.TRAILING_SLASH not in TRAILING_SLASH_POLICIES:
+            raise InvalidSetting(
+                'TRAILING_SLASH',
+                self.TRAILING_SLASH,
+                TRAILING_SLASH_POLICIES
+            )
+
+        if self.SERVER_ENGINE not in SERVER_ENGINES:
+            raise InvalidSetting(
+                'SERVER_ENGINE',
+                self.SERVER_ENGINE,
+                SERVER_ENGINES
+            )
+
+        if (not callable(self.EVENT_LOOP)
+                and self.EVENT_LOOP not in EVENT_LOOPS):
+            raise InvalidSetting(
+                'EVENT_LOOP',
+                self.EVENT_LOOP,
+                EVENT_LOOPS
+            )
+
     def __str__(self):
         return (
             f'Settings for {self.APP_NAME} {{\n'
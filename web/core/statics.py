@@ -1,28 +1,59 @@
 __all__ = [
     'get_all_statics',
     'load_static',
+    'make_static',
+    'scan_directory',
     'get_static',
     'Static',
+    'StaticCache',
+    'parse_range',
+    'fingerprint_url',
+    'fingerprint_static',
+    'static_url',
     'sp'
 ]
 
-import gzip
+import os
+import time
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from email.utils import (
+    formatdate,
+    parsedate_to_datetime
+)
 from typing import (
-    Generator,
     NoReturn,
     Union
 )
-from pathlib import Path
 
 from web.http import (
     HttpResponse,
-    HTTP_STATUS_200
+    FileResponse,
+    FilePart,
+    Headers,
+    HTTP_STATUS_200,
+    HTTP_STATUS_206,
+    HTTP_STATUS_304,
+    HTTP_STATUS_406,
+    HTTP_STATUS_416
 )
 from web.utils import (
     to_correct,
     splitext
 )
 from web.core.exceptions import StaticNotFound
+from web.core.executor import (
+    IOExecutor,
+    run_io
+)
+from web.core.encoders import (
+    IDENTITY,
+    encoders,
+    compressible,
+    negotiate
+)
 
 mime_types = {
     '.aac': 'audio/aac',
@@ -137,70 +168,685 @@ mime_types = {
     '.tiff-fx': 'image/tiff-fx'
 }
 
-UPaths = list[
-    tuple[
-        str,
-        Generator[Path, None, None]
-    ]
-]
+# whether the content of a type is worth compressing,
+# an entry can be changed to override the default.
+compressible_types: dict[str, bool] = {
+    content_type: compressible(content_type)
+    for content_type in mime_types.values()
+}
+
+# Cache-Control of the fingerprinted urls.
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# hex digits of the content hash in a fingerprinted url.
+FINGERPRINT_LENGTH = 12
+
+# more ranges in one request, after the overlapping
+# and adjacent ones are coalesced, are not served as 206.
+MAX_RANGES = 16
+
+ByteRange = tuple[int, int]
+
+Entries = dict[str, str]
+
+# the content of a file and the ETag it was read with.
+Content = tuple[bytes, str]
 
 _fn_type = type(lambda: None)
 get_app = None
 
 
+def stat_etag(stat: os.stat_result) -> str:
+    """
+    Returns the strong ETag built from the inode,
+    the mtime and the size of the file.
+    """
+    return f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
 class Static:
     __slots__ = (
         'url',
         'path',
         'content_type',
-        'gzip_compression'
+        'gzip_compression',
+        'etag',
+        'last_modified',
+        'mtime',
+        'size',
+        'checked',
+        'cache_control',
+        'pinned',
+        'variants'
     )
 
     url: str
     path: str
     content_type: Union[str, None]
+    etag: str
+    last_modified: str
+    mtime: float
+    size: int
+    checked: float
+    cache_control: Union[str, None]
+    pinned: bool
+    variants: dict[str, tuple[str, bytes]]
 
     def __init__(
             self,
             url: str,
             path: str,
             content_type: Union[str, None],
-            gzip_compression: bool = False
+            gzip_compression: bool = False,
+            cache_control: Union[str, None] = None,
+            stat: Union[os.stat_result, None] = None,
+            pinned: bool = False
     ) -> None:
         self.url = url
         self.path = path
         self.content_type = content_type
         self.gzip_compression = gzip_compression
+        self.cache_control = cache_control
+        self.pinned = pinned
+        self.variants = {}
+        self.update(stat)
+
+    def update(self, stat: Union[os.stat_result, None] = None) -> None:
+        """
+        Takes the validators of the file from os.stat.
+        """
+        if stat is None:
+            stat = os.stat(self.path)
+
+        self.etag = stat_etag(stat)
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.mtime = stat.st_mtime
+        self.size = stat.st_size
+        self.checked = time.monotonic()
+
+    async def revalidate(
+            self,
+            interval: float,
+            executor: Union[IOExecutor, None] = None
+    ) -> None:
+        """
+        Updates the validators if they are older than
+        interval seconds, os.stat runs in the executor.
+        A pinned static is checked on every call and
+        raises FileNotFoundError once the file no longer
+        has the content it was pinned to.
+        """
+        if self.pinned:
+            stat = await run_io(executor, os.stat, self.path)
+            if stat_etag(stat) != self.etag:
+                raise FileNotFoundError(self.path)
+
+        elif time.monotonic() - self.checked >= interval:
+            self.update(await run_io(executor, os.stat, self.path))
+
+    def not_modified(self, headers: Headers) -> bool:
+        """
+        Checks If-None-Match or, without it, If-Modified-Since
+        of the request against the validators of the file.
+        The ETag of any encoding of the file matches.
+        """
+        if if_none_match := headers.get('if-none-match'):
+            prefix = self.etag[:-1] + '-'
+            for etag in if_none_match.split(','):
+                etag = etag.strip().removeprefix('W/')
+                if (etag == '*' or etag == self.etag
+                        or etag.startswith(prefix)):
+                    return True
+
+            return False
+
+        if if_modified_since := headers.get('if-modified-since'):
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+
+            return int(self.mtime) <= since.timestamp()
+
+        return False
+
+    def get_headers(
+            self,
+            encoding: str = IDENTITY,
+            etag: Union[str, None] = None
+    ) -> dict[str, str]:
+        """
+        Returns the headers of the representation
+        of the file in the encoding, etag is the one of
+        the content if it differs from the current one.
+        """
+        etag = etag or self.etag
+        headers = {
+            'Content-Type': self.content_type or '',
+            'ETag': (
+                etag if encoding == IDENTITY
+                else f'{etag[:-1]}-{encoding}"'
+            ),
+            'Last-Modified': self.last_modified,
+            'Accept-Ranges': 'bytes'
+        }
+        if self.gzip_compression:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if self.cache_control:
+            headers['Cache-Control'] = self.cache_control
+
+        return headers
+
+    def not_modified_response(self) -> HttpResponse:
+        """
+        Returns body-less HttpResponse 304.
+        """
+        headers = self.get_headers()
+        del headers['Content-Type']
+        return HttpResponse(status=HTTP_STATUS_304, headers=headers)
+
+    def get_range_response(
+            self,
+            headers: Headers
+    ) -> Union[HttpResponse, None]:
+        """
+        Returns HttpResponse 206 with the ranges of the
+        Range header in the identity encoding, or 416 if
+        none of them is satisfiable. Returns None if the
+        whole file must be sent: there is no valid Range
+        header or If-Range does not match the file.
+        Several ranges are sent as a multipart body whose
+        parts are slices of the file, so the body is
+        never built in memory.
+        """
+        if not (range_header := headers.get('range')):
+            return None
+
+        if (if_range := headers.get('if-range')) and if_range not in (
+                self.etag, self.last_modified):
+            return None
+
+        if (ranges := parse_range(range_header, self.size)) is None:
+            return None
 
-    async def get_http_response(self) -> HttpResponse:
+        _headers = self.get_headers()
+        if not ranges:
+            _headers['Content-Range'] = f'bytes */{self.size}'
+            del _headers['Content-Type']
+            return HttpResponse(status=HTTP_STATUS_416, headers=_headers)
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            _headers['Content-Range'] = f'bytes {start}-{end}/{self.size}'
+            return FileResponse(
+                status=HTTP_STATUS_206,
+                path=self.path,
+                headers=_headers,
+                offset=start,
+                size=end - start + 1
+            )
+
+        boundary = secrets.token_hex(16)
+        _headers['Content-Type'] = (
+            f'multipart/byteranges; boundary={boundary}'
+        )
+        return FileResponse(
+            status=HTTP_STATUS_206,
+            path=self.path,
+            headers=_headers,
+            parts=self.multipart(ranges, boundary)
+        )
+
+    def multipart(
+            self,
+            ranges: list[ByteRange],
+            boundary: str
+    ) -> list[FilePart]:
+        """
+        Returns the parts of the multipart/byteranges
+        body, the ranges are slices of the file.
+        """
+        parts = []
+        for start, end in ranges:
+            parts.append(
+                f'--{boundary}\r\n'
+                f'Content-Type: {self.content_type or ""}\r\n'
+                f'Content-Range: bytes {start}-{end}/{self.size}'
+                f'\r\n\r\n'.encode()
+            )
+            parts.append((start, end - start + 1))
+            parts.append(b'\r\n')
+
+        parts.append(f'--{boundary}--\r\n'.encode())
+        return parts
+
+    async def variant(
+            self,
+            encoding: str,
+            cache: Union['StaticCache', None] = None,
+            executor: Union[IOExecutor, None] = None
+    ) -> tuple[str, bytes]:
+        """
+        Returns the ETag and the content of the file
+        compressed with the encoding. The variant of the
+        current ETag is taken from the precompressed ones
+        or the cache, otherwise the content is compressed
+        in the executor and kept with the ETag of the
+        content it was compressed from: in place of the
+        precompressed variant if there was one, so it is
+        never evicted, otherwise in the cache.
+        """
+        if ((variant := self.variants.get(encoding)) is not None
+                and variant[0] == self.etag):
+            return variant
+
+        if cache is not None:
+            if (data := cache.get_variant(
+                    self.path, encoding, self.etag)) is not None:
+                return self.etag, data
+
+        content, etag = await load_static(self.path, cache, executor)
+        if self.pinned and etag != self.etag:
+            raise FileNotFoundError(self.path)
+
+        data = await run_io(executor, encoders[encoding], content)
+        if encoding in self.variants:
+            self.variants = {**self.variants, encoding: (etag, data)}
+        elif cache is not None:
+            cache.put_variant(self.path, encoding, etag, data)
+
+        return etag, data
+
+    def precompress(
+            self,
+            cache: Union['StaticCache', None] = None,
+            min_size: int = 0
+    ) -> None:
         """
-        Returns HttpResponse static file.
+        Compresses the file with every available encoder
+        unless it is smaller than min_size. The variants are
+        kept on the static, outside the byte bound of the
+        cache, the content is loaded through the cache.
         """
-        content = await load_static(self.path)
+        if self.size < min_size:
+            return None
+
+        content, etag = (
+            cache.load(self.path) if cache is not None
+            else read_file(self.path)
+        )
+        self.variants = {
+            encoding: (etag, encoder(content))
+            for encoding, encoder in encoders.items()
+        }
+
+    async def get_http_response(
+            self,
+            accept_encoding: Union[str, None] = None,
+            cache: Union['StaticCache', None] = None,
+            min_size: int = 0,
+            executor: Union[IOExecutor, None] = None
+    ) -> HttpResponse:
+        """
+        Returns HttpResponse static file in the encoding
+        negotiated with the Accept-Encoding header, or 406
+        if the client excludes identity and accepts none
+        of the encodings of the file. An uncompressed file
+        is returned as FileResponse and is not read into
+        memory by the std server, the content of a compressed
+        one is loaded through the cache and the executor.
+        Files smaller than min_size are not compressed.
+        """
+        headers = self.get_headers()
+        available = (
+            encoders if self.gzip_compression and self.size >= min_size
+            else ()
+        )
+        if (encoding := negotiate(accept_encoding, available)) is None:
+            del headers['Content-Type']
+            return HttpResponse(status=HTTP_STATUS_406, headers=headers)
+
+        if encoding == IDENTITY:
+            return FileResponse(
+                status=HTTP_STATUS_200,
+                path=self.path,
+                headers=headers,
+                size=self.size
+            )
+
+        etag, body = await self.variant(encoding, cache, executor)
+        headers = self.get_headers(encoding, etag)
+        headers['Content-Encoding'] = encoding
         return (
             HttpResponse(
                 status=HTTP_STATUS_200,
-                body=gzip.compress(content) if self.gzip_compression else content,
-                headers={
-                    'Content-Type': self.content_type or '',
-                    **(
-                        {
-                            'Content-Encoding': 'gzip',
-                            'Vary': 'Accept-Encoding'
-                        }
-                        if self.gzip_compression else {}
-                    )
-                }
+                body=body,
+                headers=headers
             )
         )
 
 
+class StaticEntry:
+    __slots__ = (
+        'content',
+        'etag',
+        'checked'
+    )
+
+    content: bytes
+    etag: str
+    checked: float
+
+    def __init__(
+            self,
+            content: bytes,
+            etag: str,
+            checked: float = 0.0
+    ) -> None:
+        self.content = content
+        self.etag = etag
+        self.checked = checked
+
+
+class StaticCache:
+    """
+    LRU cache of static file contents keyed by the
+    path and bounded by their total size in bytes.
+    An entry is checked with os.stat at most once per
+    revalidate seconds and is reloaded if the ETag
+    of the file has changed. The compressed
+    variants are kept in the same LRU, keyed by the path
+    and the encoding and valid for the ETag of the
+    file they were compressed from.
+    """
+    __slots__ = (
+        'max_bytes',
+        'revalidate',
+        'bytes',
+        'hits',
+        'misses',
+        'evictions',
+        'entries',
+        'lock'
+    )
+
+    max_bytes: int
+    revalidate: float
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    entries: OrderedDict[Union[str, tuple[str, str]], StaticEntry]
+    lock: threading.Lock
+
+    def __init__(
+            self,
+            max_bytes: int,
+            revalidate: float = 1.0
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path: str) -> Union[Content, None]:
+        """
+        Returns the content of the file and its ETag
+        if its entry was checked less than revalidate
+        seconds ago, without any I/O, otherwise None.
+        """
+        with self.lock:
+            entry = self.entries.get(path)
+            if (entry is None
+                    or time.monotonic() - entry.checked >= self.revalidate):
+                return None
+
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return entry.content, entry.etag
+
+    def load(self, path: str) -> Content:
+        """
+        Returns the content of the file and its ETag,
+        from the cache if it is still valid.
+        The file is read outside the lock,
+        so it can be called from several threads.
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(path)
+
+        if entry is not None:
+            if now - entry.checked >= self.revalidate:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    with self.lock:
+                        self.discard(path)
+                    raise
+
+                if stat_etag(stat) != entry.etag:
+                    with self.lock:
+                        self.discard(path)
+                    entry = None
+                else:
+                    entry.checked = now
+
+            if entry is not None:
+                with self.lock:
+                    if path in self.entries:
+                        self.entries.move_to_end(path)
+                    self.hits += 1
+                return entry.content, entry.etag
+
+        content, etag = read_file(path)
+        with self.lock:
+            self.misses += 1
+            self.store(path, StaticEntry(content, etag, now))
+
+        return content, etag
+
+    def get_variant(
+            self,
+            path: str,
+            encoding: str,
+            etag: str
+    ) -> Union[bytes, None]:
+        """
+        Returns the content of the file compressed with
+        the encoding if it was compressed from the file
+        with the etag, otherwise None.
+        """
+        with self.lock:
+            entry = self.entries.get((path, encoding))
+            if entry is None or entry.etag != etag:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end((path, encoding))
+            self.hits += 1
+            return entry.content
+
+    def put_variant(
+            self,
+            path: str,
+            encoding: str,
+            etag: str,
+            data: bytes
+    ) -> None:
+        """
+        Stores the content of the file compressed
+        with the encoding from the file with the etag.
+        """
+        with self.lock:
+            self.store((path, encoding), StaticEntry(data, etag))
+
+    def store(
+            self,
+            key: Union[str, tuple[str, str]],
+            entry: StaticEntry
+    ) -> None:
+        # the caller holds the lock.
+        if len(entry.content) > self.max_bytes:
+            return None
+
+        self.discard(key)
+        self.entries[key] = entry
+        self.bytes += len(entry.content)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted.content)
+            self.evictions += 1
+
+    def discard(self, key: Union[str, tuple[str, str]]) -> None:
+        # the caller holds the lock.
+        if (entry := self.entries.pop(key, None)) is not None:
+            self.bytes -= len(entry.content)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f'<{self.__class__.__name__} '
+            f'bytes={self.bytes} hits={self.hits} '
+            f'misses={self.misses} evictions={self.evictions}>'
+        )
+
+
+def parse_range(
+        range_header: str,
+        size: int
+) -> Union[list[ByteRange], None]:
+    """
+    Parses the byte ranges of the Range header into
+    inclusive (start, end) pairs within size, sorted
+    and with the overlapping and adjacent ranges
+    coalesced, so the body is never larger than the
+    file. Returns an empty list if no range is
+    satisfiable and None if the header is invalid or
+    has more than MAX_RANGES ranges and must be ignored.
+    """
+    unit, _, specs = range_header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash or not (first or last):
+            return None
+
+        if not (first or '0').isdigit() or not (last or '0').isdigit():
+            return None
+
+        if not first:
+            if (suffix := int(last)) and size:
+                ranges.append((max(size - suffix, 0), size - 1))
+
+            continue
+
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    coalesced = []
+    for start, end in sorted(ranges):
+        if coalesced and start <= coalesced[-1][1] + 1:
+            coalesced[-1] = (coalesced[-1][0], max(coalesced[-1][1], end))
+        else:
+            coalesced.append((start, end))
+
+    if len(coalesced) > MAX_RANGES:
+        return None
+
+    return coalesced
+
+
 def auto_definition(path: str):
     return mime_types.get(splitext(path))
 
 
-async def load_static(path):
-    return open(path, 'rb').read()
+def read_file(path: str) -> Content:
+    """
+    Returns the content of the file and the ETag
+    taken from the opened file, so it is the ETag
+    of the content that was read.
+    """
+    with open(path, 'rb') as file:
+        etag = stat_etag(os.fstat(file.fileno()))
+        return file.read(), etag
+
+
+async def load_static(
+        path: str,
+        cache: Union[StaticCache, None] = None,
+        executor: Union[IOExecutor, None] = None
+) -> Content:
+    """
+    Returns the content of the file and its ETag,
+    through the cache if it is given. A fresh cached
+    content is returned at once, the file is read
+    in the executor.
+    """
+    if cache is None:
+        return await run_io(executor, read_file, path)
+
+    if (content := cache.get(path)) is not None:
+        return content
+
+    return await run_io(executor, cache.load, path)
+
+
+def make_static(
+        url: str,
+        path: str,
+        media_types: dict
+) -> Static:
+    """
+    Returns Static of the file with the content
+    type and the compressibility of its extension.
+    """
+    content_type = (
+        media_types.get(splitext(path)[-1])
+        or auto_definition(path)
+    )
+    return Static(
+        url,
+        path,
+        content_type,
+        gzip_compression=compressible_types.get(
+            content_type, compressible(content_type))
+    )
+
+
+def scan_directory(url: str, path: str) -> tuple[Entries, Entries]:
+    """
+    Lists one directory with os.scandir and returns
+    the urls of its files and of its subdirectories
+    mapped to their paths, the type of an entry is
+    taken from the directory listing without a stat call.
+    """
+    files, directories = {}, {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files[to_correct(url + entry.name)] = entry.path
+            elif entry.is_dir():
+                directories[to_correct(url + entry.name)] = entry.path
+
+    return files, directories
 
 
 def get_all_statics(
@@ -215,36 +861,69 @@ def get_all_statics(
     which it returns upon completion.
     """
     statics = {}
-    upaths: UPaths = [
-        (
-            root_url,
-            Path(root_path).iterdir()
-        )
-    ]
-    for url, paths in upaths:
-        for path in paths:
-            if path.is_file():
-                _url = to_correct(url + path.name)
-                _path = str(path.absolute())
-
-                statics[_url] = Static(
-                    _url,
-                    _path,
-                    media_types.get(
-                        splitext(_path)[-1]
-                    ) or auto_definition(_path),
-                    gzip_compression=True
-                )
-
-            elif path.is_dir():
-                upaths.append((
-                    to_correct(url + path.name),
-                    path.iterdir()
-                ))
+    directories = [(root_url, os.path.abspath(root_path))]
+    for url, path in directories:
+        files, subdirectories = scan_directory(url, path)
+        for _url, _path in files.items():
+            statics[_url] = make_static(_url, _path, media_types)
+
+        directories.extend(subdirectories.items())
 
     return statics
 
 
+def fingerprint_url(url: str, digest: str) -> str:
+    """
+    Inserts the digest before the extension
+    of the file name: /js/app.js -> /js/app.<digest>.js
+    """
+    head, _, name = url.rstrip('/').rpartition('/')
+    stem, dot, extension = name.rpartition('.')
+    if not stem:
+        return to_correct(f'{head}/{name}.{digest}')
+
+    return to_correct(f'{head}/{stem}.{digest}.{extension}')
+
+
+def fingerprint_static(static: Static) -> Static:
+    """
+    Returns Static of the file at the url with the
+    hash of its content and the immutable Cache-Control,
+    pinned to the validators the file was hashed with.
+    """
+    with open(static.path, 'rb') as file:
+        stat = os.fstat(file.fileno())
+        digest = hashlib.file_digest(file, 'sha256').hexdigest()
+
+    fingerprinted = Static(
+        fingerprint_url(static.url, digest[:FINGERPRINT_LENGTH]),
+        static.path,
+        static.content_type,
+        static.gzip_compression,
+        cache_control=IMMUTABLE,
+        stat=stat,
+        pinned=True
+    )
+    fingerprinted.variants = static.variants
+    return fingerprinted
+
+
+def static_url(url: str) -> str:
+    """
+    Returns the fingerprinted url of the static
+    if STATIC_FINGERPRINT=True, otherwise the url.
+    For use in views and templates.
+    """
+    global get_app
+
+    if not get_app:
+        from web.core import get_app
+
+    url = to_correct(url)
+    url = get_app().settings.static_manifest.get(url, url)
+    return url[:-1] if len(url) > 1 else url
+
+
 def sp(
         root_url: str,
         root_path: str,
@@ -279,7 +958,9 @@ async def get_static(url: str) -> Union[bytes, NoReturn]:
         if not static:
             raise StaticNotFound()
 
-        return await load_static(static.path)
+        content, _ = await load_static(
+            static.path, app.static_cache, app.io_executor)
+        return content
 
     raise TypeError(
         f'get_app must be of type '
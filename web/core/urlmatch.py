@@ -2,11 +2,110 @@ __all__ = [
     'correct_url',
     'is_var',
     'var_parser',
+    'parse_var',
+    'Converter',
+    'IntConverter',
+    'UUIDConverter',
+    'SlugConverter',
+    'PathConverter',
+    'converters',
     'split_into_catalogs',
+    'split_path',
     'pattern_matching'
 ]
 
-from typing import Union
+import re
+import uuid
+
+from typing import (
+    Union,
+    Any
+)
+from web.core.exceptions import InvalidUrlPattern
+
+
+class Converter:
+    """
+    Converts the catalog of the url to the
+    value passed to the view. If the catalog
+    does not fit, raises ValueError and the
+    pattern is not matched.
+    """
+    __slots__ = ()
+
+    name = 'str'
+    priority = 3
+    greedy = False
+
+    def to_python(self, value: str) -> Any:
+        return value
+
+
+class IntConverter(Converter):
+    __slots__ = ()
+
+    name = 'int'
+    priority = 0
+
+    def to_python(self, value: str) -> int:
+        if not (value.isascii() and value.isdigit()):
+            raise ValueError(value)
+
+        return int(value)
+
+
+class UUIDConverter(Converter):
+    __slots__ = ()
+
+    name = 'uuid'
+    priority = 1
+    # only the canonical form, so one uuid has one url.
+    regex = re.compile(
+        r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+    def to_python(self, value: str) -> uuid.UUID:
+        if not self.regex.fullmatch(value):
+            raise ValueError(value)
+
+        return uuid.UUID(value)
+
+
+class SlugConverter(Converter):
+    __slots__ = ()
+
+    name = 'slug'
+    priority = 2
+    regex = re.compile(r'[-a-zA-Z0-9_]+')
+
+    def to_python(self, value: str) -> str:
+        if not self.regex.fullmatch(value):
+            raise ValueError(value)
+
+        return value
+
+
+class PathConverter(Converter):
+    """
+    Takes all the remaining catalogs,
+    so it can only be the last one in the pattern.
+    """
+    __slots__ = ()
+
+    name = 'path'
+    priority = 4
+    greedy = True
+
+
+converters: dict[str, Converter] = {
+    converter.name: converter
+    for converter in (
+        Converter(),
+        IntConverter(),
+        UUIDConverter(),
+        SlugConverter(),
+        PathConverter()
+    )
+}
 
 
 def correct_url(url: str, separator: str) -> str:
@@ -24,12 +123,30 @@ def is_var(catalog: str) -> bool:
 
 
 def var_parser(catalog: str) -> Union[str, None]:
-    if is_var(catalog):
-        return catalog[1:][:-1]
+    if var := parse_var(catalog):
+        return var[1]
 
     return None
 
 
+def parse_var(catalog: str) -> Union[tuple[Converter, str], None]:
+    """
+    Parses '<name>' or '<converter:name>'
+    and returns the converter with the name
+    of the variable.
+    """
+    if not is_var(catalog):
+        return None
+
+    converter_name, _, var_name = catalog[1:][:-1].rpartition(':')
+    converter = converters.get(converter_name or 'str')
+    if converter is None:
+        raise InvalidUrlPattern(
+            catalog, f"unknown converter '{converter_name}'")
+
+    return converter, var_name
+
+
 def split_into_catalogs(
         path: str,
         separator: str
@@ -40,6 +157,15 @@ def split_into_catalogs(
     )
 
 
+def split_path(url: str) -> list[str]:
+    """
+    Splits the url into catalogs,
+    the root url "/" gives an empty list.
+    """
+    url = correct_url(url, '/')
+    return url.split('/') if url else []
+
+
 def pattern_matching(
         url: str,
         pattern: str,
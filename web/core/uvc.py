@@ -28,7 +28,7 @@ def exc_uvicorn_response(
             'type': 'http.response.start',
             'status': status_code,
             'headers': [
-                ('content-type', 'text/plain')
+                (b'content-type', b'text/plain')
             ],
         },
         {
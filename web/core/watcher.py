@@ -0,0 +1,400 @@
+__all__ = [
+    'StaticWatcher'
+]
+
+import os
+import sys
+import time
+import weakref
+import threading
+
+from typing import (
+    Callable,
+    Union
+)
+
+from web.core.statics import (
+    Static,
+    make_static,
+    scan_directory,
+    stat_etag,
+    fingerprint_static
+)
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+if inotify_simple is not None:
+    DIRECTORY_EVENTS = (
+        inotify_simple.flags.CREATE
+        | inotify_simple.flags.DELETE
+        | inotify_simple.flags.MOVED_FROM
+        | inotify_simple.flags.MOVED_TO
+    )
+    FILE_EVENTS = inotify_simple.flags.CLOSE_WRITE
+    WATCH_MASK = DIRECTORY_EVENTS | FILE_EVENTS
+
+Publish = Callable[[dict[str, Static], dict[str, str]], None]
+
+# the watchers of the process, reset in the child after a fork.
+watchers: weakref.WeakSet['StaticWatcher'] = weakref.WeakSet()
+
+
+class WatchedDirectory:
+    """
+    State of one directory of a static tree: the
+    urls of its files with the ETags they were indexed
+    with and the paths of its subdirectories as of the
+    last scan.
+    """
+    __slots__ = (
+        'url',
+        'path',
+        'media_types',
+        'mtime',
+        'files',
+        'directories',
+        'wd'
+    )
+
+    url: str
+    path: str
+    media_types: dict
+    mtime: int
+    files: dict[str, str]
+    directories: set[str]
+    wd: Union[int, None]
+
+    def __init__(
+            self,
+            url: str,
+            path: str,
+            media_types: dict
+    ) -> None:
+        self.url = url
+        self.path = path
+        self.media_types = media_types
+        self.mtime = 0
+        self.files = {}
+        self.directories = set()
+        self.wd = None
+
+
+class StaticWatcher:
+    """
+    Builds the statics index of the STATIC_FILE_DIRS
+    trees and keeps it up to date while the server runs.
+    A changed directory is scanned again on its own,
+    the files added to it or removed from it are added
+    to or removed from the index, a rewritten file gets
+    a new Static. The changes are taken from inotify if
+    inotify_simple is installed, otherwise the mtimes of
+    the directories are polled every interval seconds.
+    The index is private to the watcher, a copy of it
+    is handed to publish after every batch of changes.
+    With fingerprint=True every file is also served at
+    the url with the hash of its content.
+    """
+    __slots__ = (
+        'publish',
+        'statics',
+        'manifest',
+        'interval',
+        'changed',
+        'directories',
+        'inotify',
+        'watches',
+        'thread',
+        '__weakref__'
+    )
+
+    publish: Publish
+    statics: dict[str, Static]
+    manifest: Union[dict[str, str], None]
+    interval: float
+    changed: bool
+    directories: dict[str, WatchedDirectory]
+    watches: dict[int, WatchedDirectory]
+    thread: Union[threading.Thread, None]
+
+    def __init__(
+            self,
+            publish: Publish,
+            interval: float = 1.0,
+            fingerprint: bool = False
+    ) -> None:
+        self.publish = publish
+        self.statics = {}
+        self.manifest = {} if fingerprint else None
+        self.interval = interval
+        self.changed = False
+        self.directories = {}
+        self.inotify = None
+        self.watches = {}
+        self.thread = None
+        watchers.add(self)
+
+    def add_tree(
+            self,
+            root_url: str,
+            root_path: str,
+            media_types: dict
+    ) -> None:
+        """
+        Adds the statics of the directory tree to the index.
+        """
+        stack = [(root_url, os.path.abspath(root_path))]
+        while stack:
+            url, path = stack.pop()
+            directory = WatchedDirectory(url, path, media_types)
+            self.directories[path] = directory
+            self.watch(directory)
+            stack.extend(self.scan(directory))
+
+    def remove_tree(self, path: str) -> None:
+        """
+        Removes the statics of the directory tree from the index.
+        """
+        stack = [path]
+        while stack:
+            directory = self.directories.pop(stack.pop(), None)
+            if directory is None:
+                continue
+
+            for url in directory.files:
+                self.remove(url)
+
+            if directory.wd is not None:
+                self.watches.pop(directory.wd, None)
+
+            stack.extend(directory.directories)
+
+    def scan(self, directory: WatchedDirectory) -> list[tuple[str, str]]:
+        """
+        Scans the directory alone and updates its statics,
+        removes the trees of the deleted subdirectories
+        and returns the (url, path) of the new ones.
+        """
+        try:
+            directory.mtime = os.stat(directory.path).st_mtime_ns
+            files, directories = scan_directory(
+                directory.url, directory.path)
+        except FileNotFoundError:
+            files, directories = {}, {}
+
+        for url in directory.files.keys() - files.keys():
+            self.remove(url)
+            directory.files.pop(url)
+
+        for url, path in files.items():
+            try:
+                static = self.statics.get(url)
+                if static is None or static.path != path:
+                    self.add(directory, make_static(
+                        url, path, directory.media_types))
+                else:
+                    # replaced by a rename or rewritten.
+                    self.refresh(directory, url)
+            except FileNotFoundError:
+                self.remove(url)
+                directory.files.pop(url, None)
+
+        paths = set(directories.values())
+        for path in directory.directories - paths:
+            self.remove_tree(path)
+
+        directory.directories = paths
+        return [
+            (url, path)
+            for url, path in directories.items()
+            if path not in self.directories
+        ]
+
+    def add(self, directory: WatchedDirectory, static: Static) -> None:
+        self.statics[static.url] = static
+        directory.files[static.url] = static.etag
+        self.changed = True
+        self.fingerprint(static)
+
+    def remove(self, url: str) -> None:
+        if self.statics.pop(url, None) is not None:
+            self.changed = True
+
+        if self.manifest is not None:
+            if (previous := self.manifest.pop(url, None)) is not None:
+                self.statics.pop(previous, None)
+                self.changed = True
+
+    def refresh(self, directory: WatchedDirectory, url: str) -> None:
+        """
+        Replaces the static of the url if the ETag of
+        the file differs from the indexed one, the
+        published Static is never changed here. A file
+        that was precompressed is compressed again on
+        the first request of the new one.
+        """
+        static = self.statics[url]
+        if stat_etag(os.stat(static.path)) != directory.files.get(url) or (
+                self.manifest is not None and url not in self.manifest):
+            refreshed = make_static(url, static.path, directory.media_types)
+            refreshed.variants = static.variants
+            self.add(directory, refreshed)
+
+    def fingerprint(self, static: Static) -> None:
+        """
+        Serves the static also at the url with the hash
+        of its content, the url of its previous content
+        is removed.
+        """
+        if self.manifest is None:
+            return None
+
+        # the same content rewritten gets a new pinned Static.
+        fingerprinted = fingerprint_static(static)
+        previous = self.manifest.get(static.url)
+        self.statics[fingerprinted.url] = fingerprinted
+        self.manifest[static.url] = fingerprinted.url
+        self.changed = True
+        if previous is not None and previous != fingerprinted.url:
+            self.statics.pop(previous, None)
+
+    def flush(self) -> None:
+        """
+        Publishes a copy of the index and of the manifest
+        if they have changed since the last call.
+        """
+        if not self.changed:
+            return None
+
+        self.changed = False
+        self.publish(dict(self.statics), dict(self.manifest or {}))
+
+    def rescan(self, directory: WatchedDirectory) -> None:
+        for url, path in self.scan(directory):
+            self.add_tree(url, path, directory.media_types)
+
+    def watch(self, directory: WatchedDirectory) -> None:
+        if self.inotify is None:
+            return None
+
+        try:
+            directory.wd = self.inotify.add_watch(directory.path, WATCH_MASK)
+        except OSError:
+            return None
+
+        self.watches[directory.wd] = directory
+
+    def forked(self) -> None:
+        # the thread of the parent does not exist in the child.
+        self.thread = None
+        self.inotify = None
+        self.watches = {}
+        for directory in self.directories.values():
+            directory.wd = None
+
+    def start(self) -> None:
+        """
+        Starts the watching thread once in each process,
+        so it is started in the worker after the fork.
+        """
+        if self.thread is not None:
+            return None
+
+        self.thread = threading.Thread(
+            target=self.run,
+            name='web-statics',
+            daemon=True
+        )
+        self.thread.start()
+
+    def run(self) -> None:
+        if inotify_simple is not None:
+            try:
+                self.inotify = inotify_simple.INotify()
+            except OSError as exc:
+                sys.stderr.write(
+                    f'inotify is not available ({exc}), '
+                    f'polling the static directories.\n'
+                )
+
+        if self.inotify is None:
+            return self.poll()
+
+        for directory in list(self.directories.values()):
+            self.watch(directory)
+
+        # changes made before the watches were added.
+        self.poll_once()
+        while True:
+            self.read_events()
+
+    def read_events(self) -> None:
+        """
+        Waits for the inotify events and applies them,
+        a directory is scanned once per batch of events.
+        """
+        changed = {}
+        for event in self.inotify.read(read_delay=50):
+            if (directory := self.watches.get(event.wd)) is None:
+                continue
+
+            if event.mask & DIRECTORY_EVENTS:
+                changed[directory.path] = directory
+            elif event.mask & FILE_EVENTS and event.name:
+                url = directory.url + event.name + '/'
+                if url in directory.files:
+                    try:
+                        self.refresh(directory, url)
+                    except FileNotFoundError:
+                        changed[directory.path] = directory
+
+        for path, directory in changed.items():
+            if path in self.directories:
+                self.rescan(directory)
+
+        self.flush()
+
+    def poll_once(self) -> None:
+        for directory in list(self.directories.values()):
+            if directory.path not in self.directories:
+                continue
+
+            try:
+                mtime = os.stat(directory.path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            if mtime != directory.mtime:
+                self.rescan(directory)
+            elif self.manifest is not None:
+                # a file rewritten in place does not change
+                # the mtime of the directory, but its hash.
+                try:
+                    for url in list(directory.files):
+                        self.refresh(directory, url)
+                except FileNotFoundError:
+                    self.rescan(directory)
+
+        self.flush()
+
+    def poll(self) -> None:
+        """
+        Scans the directories whose mtime has changed
+        every interval seconds, a file rewritten in place
+        is picked up by the revalidation of its Static,
+        or here if the statics are fingerprinted.
+        """
+        while True:
+            self.poll_once()
+            time.sleep(self.interval)
+
+
+def forked() -> None:
+    for watcher in list(watchers):
+        watcher.forked()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=forked)
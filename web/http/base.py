@@ -1,12 +1,16 @@
 # base http file.
 from typing import (
     Generator,
+    Iterable,
+    Mapping,
     Union,
     Any
 )
 from urllib.parse import unquote
 from collections import UserDict
 
+from web.utils import ascii_quote
+
 HTTP_STATUS_100 = (100, 'Continue')
 HTTP_STATUS_101 = (101, 'Switching Protocols')
 HTTP_STATUS_102 = (102, 'Processing')
@@ -71,6 +75,12 @@ HTTP_STATUS_511 = (511, 'Network Authentication Required')
 
 HttpStatusType = tuple[int, str]
 KvType = Union[bytes, str]
+RawHeader = tuple[bytes, bytes]
+HeadersType = Union[
+    Mapping[KvType, KvType],
+    Iterable[tuple[KvType, KvType]],
+    None
+]
 
 
 class WebDict(UserDict):
@@ -109,6 +119,123 @@ class WebDict(UserDict):
             yield value
 
 
+def to_header_bytes(value: KvType) -> bytes:
+    """
+    Returns the header name or value as bytes,
+    a non-ascii str is percent-encoded.
+    """
+    if isinstance(value, bytes):
+        return value
+
+    if isinstance(value, str):
+        return ascii_quote(value).encode('ascii')
+
+    raise TypeError(
+        'header name and value can '
+        'only be bytes and str.'
+    )
+
+
+class Headers:
+    """
+    Case-insensitive multimap of http headers.
+    The names and values are kept as bytes in the
+    order in which they were added, so repeated headers
+    such as Set-Cookie or Vary are all kept. The index
+    of the lowercase names is built on first lookup.
+    The lookups return str values, iteration yields
+    (name, value) pairs of str.
+    """
+    __slots__ = (
+        'raw',
+        'index'
+    )
+
+    raw: list[RawHeader]
+    index: Union[dict[bytes, list[int]], None]
+
+    def __init__(self, headers: HeadersType = None) -> None:
+        self.raw = []
+        self.index = None
+        if isinstance(headers, Mapping):
+            headers = headers.items()
+
+        for name, value in headers or ():
+            self.add(name, value)
+
+    def lookup(self, name: KvType) -> list[int]:
+        if self.index is None:
+            self.index = {}
+            for position, (_name, _) in enumerate(self.raw):
+                self.index.setdefault(_name.lower(), []).append(position)
+
+        return self.index.get(to_header_bytes(name).lower(), [])
+
+    def add(self, name: KvType, value: KvType) -> None:
+        """
+        Adds the header, keeping the
+        headers of the same name.
+        """
+        name = to_header_bytes(name)
+        self.raw.append((name, to_header_bytes(value)))
+        if self.index is not None:
+            self.index.setdefault(name.lower(), []).append(len(self.raw) - 1)
+
+    def getlist(self, name: KvType) -> list[str]:
+        """
+        Returns the values of all headers of the name.
+        """
+        return [self.raw[position][1].decode('latin-1')
+                for position in self.lookup(name)]
+
+    def get(self, name: KvType, default: Any = None) -> Any:
+        """
+        Returns the value of the first header of the name.
+        """
+        if positions := self.lookup(name):
+            return self.raw[positions[0]][1].decode('latin-1')
+
+        return default
+
+    def __getitem__(self, name: KvType) -> str:
+        if (value := self.get(name)) is None:
+            raise KeyError(name)
+
+        return value
+
+    def __setitem__(self, name: KvType, value: KvType) -> None:
+        """
+        Replaces all headers of the name.
+        """
+        if name in self:
+            del self[name]
+
+        self.add(name, value)
+
+    def __delitem__(self, name: KvType) -> None:
+        if not (positions := set(self.lookup(name))):
+            raise KeyError(name)
+
+        self.raw = [
+            header for position, header in enumerate(self.raw)
+            if position not in positions
+        ]
+        self.index = None
+
+    def __contains__(self, name: KvType) -> bool:
+        return bool(self.lookup(name))
+
+    def __iter__(self) -> Generator[tuple[str, str], None, None]:
+        for name, value in self.raw:
+            yield name.decode('latin-1'), value.decode('latin-1')
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.raw!r}>'
+
+
 class BaseHttp:
     __slots__ = ()
 
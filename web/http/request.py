@@ -20,8 +20,10 @@ from web.http.exceptions import (
 )
 from web.http.base import (
     BaseHttp,
+    Headers,
     WebDict
 )
+from web.utils import lazy
 
 ParsedHttp = tuple[
     list[str],
@@ -31,35 +33,37 @@ ParsedHttp = tuple[
 
 
 class HttpRequest(BaseHttp):
+    """
+    The path fields, the headers, the cookies and
+    the payload are parsed on first access, so a view
+    pays only for the attributes it reads.
+    """
     __slots__ = (
         'method',
-        'path',
-        'headers',
+        '_path',
+        '_headers',
         'http_version',
         'client',
         'scheme',
-        'query_string',
-        'raw_path',
-        'root_path',
+        '_query_string',
+        '_raw_path',
+        '_root_path',
         'body',
-        'payload',
-        'cookies',
-        'raw_http'
+        '_payload',
+        '_cookies',
+        'raw_http',
+        'scope',
+        'raw_headers'
     )
 
     raw_http: bytes
-    payload: dict
     body: bytes
     http_version: Union[str, None]
     client: Union[tuple, None]
     scheme: str
     method: str
-    root_path: str
-    path: str
-    raw_path: str
-    query_string: str
-    headers: WebDict
-    cookies: WebDict
+    scope: dict
+    raw_headers: Iterable[tuple[AnyStr, AnyStr]]
 
     def __init__(
             self,
@@ -75,43 +79,60 @@ class HttpRequest(BaseHttp):
         if not isinstance(scope, dict):
             scope = {}
 
-        self.payload = {}
+        self.scope = scope
         self.raw_http = b''
         self.body = body
         self.http_version = scope.get('http_version')
         self.client = scope.get('client')
         self.scheme = scope.get('scheme', 'http')
         self.method = scope.get('method', '')
-        (
-            self.root_path,
-            self.path,
-            self.raw_path,
-            self.query_string
-        ) = (
-            unquote(scope.get('root_path', '')),
-            unquote(scope.get('path', '')),
-            unquote(scope.get('raw_path', '')),
-            unquote(scope.get('query_string', ''))
-        )
-        self.headers = get_headers(scope.get('headers', []))
-        self.cookies = get_cookies(self.headers.get('cookie', ''))
+        self.raw_headers = scope.get('headers', [])
 
-        self.set_payload()
+    @lazy
+    def root_path(self) -> str:
+        return unquote(self.scope.get('root_path', ''))
 
-    def set_payload(self) -> None:
+    @lazy
+    def path(self) -> str:
+        return unquote(self.scope.get('path', ''))
+
+    @lazy
+    def raw_path(self) -> str:
+        return unquote(self.scope.get('raw_path', ''))
+
+    @lazy
+    def query_string(self) -> str:
+        return unquote(self.scope.get('query_string', ''))
+
+    @lazy
+    def headers(self) -> Headers:
+        return get_headers(self.raw_headers)
+
+    @lazy
+    def cookies(self) -> WebDict:
+        return get_cookies(self.headers.get('cookie', ''))
+
+    @lazy
+    def payload(self) -> dict:
+        payload = {}
         if (self.method == self.METHOD_GET
                 and self.query_string):
-            self.payload.update(
+            payload.update(
                 self.parse_query_string()
             )
 
         elif self.method == self.METHOD_POST:
-            self.payload.update(
+            payload.update(
                 self.parse_query_string(
                     unquote(self.body)
                 )
             )
 
+        return payload
+
+    def set_payload(self) -> None:
+        lazy.reset(self, 'payload')
+
     @staticmethod
     def check_http(http):
         if not http:
@@ -134,17 +155,13 @@ class HttpRequest(BaseHttp):
 
         self.raw_http = http
         self.http_version = http_version.split('/')[1]
-        self.headers = get_headers(_headers)
-        self.cookies = get_cookies(
-            self.headers.get('cookie', '')
-        )
+        self.raw_headers = list(_headers)
+        lazy.reset(self, 'query_string', 'headers', 'cookies', 'payload')
         if '?' in self.path and self.method == self.METHOD_GET:
             index = self.path.index('?')
             self.query_string = unquote(self.path[index + 1:])
             self.path = self.path[:index]
 
-        self.set_payload()
-
         return self
 
     @staticmethod
@@ -154,16 +171,13 @@ class HttpRequest(BaseHttp):
         """
         A generator that processes a list
         of http headers and at each iteration produces
-        a tuple from the header name and its value.
+        a tuple from the header name and its value,
+        the value is split off at the first colon only.
         """
         for header in headers:
-            processed_header: list[bytes] = (
-                header
-                .replace(b': ', b':')
-                .split(b':')
-            )
-            if processed_header:
-                yield processed_header[0], processed_header[1]
+            name, colon, value = header.partition(b':')
+            if colon:
+                yield name.strip(), value.strip()
 
     @classmethod
     def parse(cls, raw_http: bytes) -> ParsedHttp | NoReturn:
@@ -172,7 +186,7 @@ class HttpRequest(BaseHttp):
         argument and returns a tuple containing
         HTTP request in processed form.
         """
-        http: list[bytes] = raw_http.split(cls.ln * 2)
+        http: list[bytes] = raw_http.split(cls.ln * 2, 1)
         if len(http) != 2:
             raise HttpSyntaxError()
 
@@ -221,15 +235,12 @@ def get_headers(
         headers: Iterable[
             tuple[AnyStr, AnyStr]
         ]
-) -> WebDict:
+) -> Headers:
     """
     Converts the "headers" argument
-    to the WebDict class.
+    to the Headers class.
     """
-    return WebDict({
-        key: value
-        for key, value in headers
-    })
+    return Headers(headers)
 
 
 def get_cookies(cookies: str) -> WebDict:
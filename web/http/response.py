@@ -1,24 +1,24 @@
 __all__ = [
-    'HttpResponse'
+    'HttpResponse',
+    'FileResponse',
+    'FilePart'
 ]
 
-from typing import Iterable
+import os
+from typing import (
+    Iterable,
+    Union
+)
 
 from web.http import (
     BaseHttp,
     HttpStatusType,
-    WebDict
-)
-from web.utils import (
-    concat,
-    ascii_quote
+    Headers,
+    HeadersType,
+    RawHeader
 )
 
 
-def enc(t: tuple[str, str]) -> tuple[bytes, bytes]:
-    return t[0].encode(), t[1].encode()
-
-
 class HttpResponse(BaseHttp):
     __slots__ = (
         'status',
@@ -31,13 +31,13 @@ class HttpResponse(BaseHttp):
     http_version: str
     status_code: int
     status: str
-    headers: WebDict
+    headers: Headers
     body: bytes
 
     def __init__(
             self,
             status: HttpStatusType,
-            headers: dict | None = None,
+            headers: HeadersType = None,
             body: bytes = b''
     ) -> None:
         if not isinstance(body, bytes):
@@ -50,50 +50,125 @@ class HttpResponse(BaseHttp):
         self.status_code = int(status[0])
         self.status = str(status[1])
         self.body = body
-        self.headers = WebDict(headers)
+        self.headers = Headers(headers)
 
     def _collect(
             self,
-            _list: Iterable[tuple[str, str]],
+            _list: Iterable[RawHeader],
     ) -> bytes:
-        between = ': '
-        return (
-            result
-            if isinstance(
-                result := concat(
-                    result.encode()
-                    for key, value in _list
-                    if isinstance(
-                        result := concat((
-                            ascii_quote(key),
-                            between,
-                            ascii_quote(value),
-                            self.ln.decode()
-                        )), str
-                    )
-                ), bytes)
-
-            else result.encode()
+        return b''.join(
+            b'%s: %s%s' % (name, value, self.ln)
+            for name, value in _list
         )
 
-    def as_http(self) -> bytes:
-        return (
-            result
-            if isinstance(
-                result := concat(
-                    (
-                        (
-                            f'{self.http_version} '
-                            f'{self.status_code} '
-                            f'{self.status}'
-                            .encode()
-                        ),
-                        self.ln,
-                        self._collect(self.headers),
-                        self.ln,
-                        self.body
-                    )
-                ), bytes
-            )
-            else result.encode()
+    def get_headers(self) -> list[RawHeader]:
+        """
+        Returns the response headers with
+        Content-Length added if it is not set
+        and the status code allows a body.
+        """
+        headers = list(self.headers.raw)
+        if (self.status_code >= 200
+                and self.status_code not in (204, 304)
+                and 'content-length' not in self.headers):
+            headers.append((b'Content-Length', b'%d' % len(self.body)))
+
+        return headers
+
+    def as_http(self, body: bool = True) -> bytes:
+        """
+        Serializes the response, the body
+        is omitted if body=False (HEAD request).
+        """
+        return b''.join((
+            f'{self.http_version} {self.status_code} {self.status}'.encode(),
+            self.ln,
+            self._collect(self.get_headers()),
+            self.ln,
+            self.body if body else b''
+        ))
+
+
+FilePart = Union[bytes, tuple[int, int]]
+
+
+class FileResponse(HttpResponse):
+    """
+    Response whose body is size bytes of the file
+    at path starting from offset, or the parts: bytes
+    and (offset, size) slices of the file, such as
+    a multipart/byteranges body. The std server writes
+    the head and then sends the slices with sendfile,
+    without reading the file into memory.
+    """
+    __slots__ = (
+        'path',
+        'parts',
+        'size'
+    )
+
+    path: str
+    parts: list[FilePart]
+    size: int
+
+    def __init__(
+            self,
+            status: HttpStatusType,
+            path: str,
+            headers: HeadersType = None,
+            offset: int = 0,
+            size: int | None = None,
+            parts: list[FilePart] | None = None
+    ) -> None:
+        super().__init__(status, headers)
+        self.path = path
+        if parts is None:
+            if size is None:
+                size = os.stat(path).st_size - offset
+
+            parts = [(offset, size)]
+
+        self.parts = parts
+        self.size = sum(
+            len(part) if isinstance(part, bytes) else part[1]
+            for part in parts
         )
+
+    @property
+    def whole(self) -> bool:
+        """
+        True if the body is the whole file.
+        """
+        return (self.parts[0][0] == 0 and len(self.parts) == 1
+                and 'content-range' not in self.headers)
+
+    def read(self) -> bytes:
+        """
+        Returns the body read from the file.
+        """
+        body = []
+        with open(self.path, 'rb') as file:
+            for part in self.parts:
+                if isinstance(part, bytes):
+                    body.append(part)
+                else:
+                    file.seek(part[0])
+                    body.append(file.read(part[1]))
+
+        return b''.join(body)
+
+    def get_headers(self) -> list[RawHeader]:
+        headers = list(self.headers.raw)
+        if 'content-length' not in self.headers:
+            headers.append((b'Content-Length', b'%d' % self.size))
+
+        return headers
+
+    def as_http(self, body: bool = True) -> bytes:
+        """
+        Serializes the response, reading the file
+        into the body, the server uses the head
+        only and sends the file separately.
+        """
+        head = super().as_http(body=False)
+        return head + self.read() if body else head
@@ -1,43 +1,207 @@
+import os
 import socket
+import signal
 import asyncio
 
+from web.http import FileResponse
+from web.server.parser import (
+    IDLE,
+    RequestParser,
+    error_response
+)
+from web.server.exceptions import BadRequest
+from web.server import protocol
+from web.server.files import sock_sendfile
+from web.server.workers import Supervisor
+from web.server.state import (
+    SERVICE_UNAVAILABLE,
+    ServerState
+)
+from web.server.loops import set_event_loop_policy
 
-def create_socket(host='0.0.0.0', port=8000):
+RECV_SIZE = 65536
+
+
+def create_socket(host='0.0.0.0', port=8000, reuse_port=False):
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name != 'nt':
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
     sock.bind((host, port))
     sock.listen()
 
     return sock
 
 
-async def client_handler(app, coro, _sock):
+async def recv_into(loop, _sock, buffer, timeout=None) -> int:
+    if timeout is None:
+        return await loop.sock_recv_into(_sock, buffer)
+
+    return await asyncio.wait_for(
+        loop.sock_recv_into(_sock, buffer), timeout)
+
+
+async def client_handler(app, coro, _sock, state: ServerState):
+    """
+    Serves requests of a persistent connection
+    one after another, so pipelined requests are
+    answered in order. The connection is closed
+    when the client asks for it, the server drains
+    or reading of the head, the body or the next
+    request takes longer than its timeout.
+    """
     loop = asyncio.get_running_loop()
-    _sock.send(
-        await coro(
-            app,
-            await loop.sock_recv(_sock, 1024),
-            _sock.getpeername()
-        )
-    )
-    _sock.close()
+    close = asyncio.current_task().cancel
+    parser = RequestParser(state.max_body_size)
+    buffer = memoryview(bytearray(RECV_SIZE))
+    keep_alive = True
+    phase = deadline = None
+    try:
+        client = _sock.getpeername()
+        while keep_alive and not state.draining:
+            while (parsed := parser.next_request()) is None:
+                if parser.phase != phase:
+                    phase = parser.phase
+                    timeout = state.timeouts.get(phase)
+                    deadline = loop.time() + timeout if timeout else None
+
+                if phase == IDLE:
+                    state.idle.add(close)
+                try:
+                    size = await recv_into(
+                        loop, _sock, buffer,
+                        None if deadline is None else deadline - loop.time()
+                    )
+                except asyncio.TimeoutError:
+                    state.stats.timeouts[phase] += 1
+                    return
+                finally:
+                    state.idle.discard(close)
 
+                if not size:
+                    return
 
-async def main(app, coro, sock: socket.socket):
+                parser.feed(buffer[:size])
+
+            phase = None
+            request, keep_alive = parsed
+            keep_alive = keep_alive and not state.draining
+            state.stats.requests += 1
+            response = await coro(app, request, client, keep_alive)
+            if isinstance(response, FileResponse):
+                await sock_sendfile(
+                    loop, _sock, response, app.io_executor)
+            else:
+                await loop.sock_sendall(_sock, response)
+
+    except BadRequest as exc:
+        state.stats.bad_requests += 1
+        await loop.sock_sendall(_sock, error_response(exc))
+    except OSError:
+        pass
+    finally:
+        _sock.close()
+        state.release()
+
+
+async def reject(loop, _sock):
+    try:
+        await loop.sock_sendall(_sock, SERVICE_UNAVAILABLE)
+    except OSError:
+        pass
+    finally:
+        _sock.close()
+
+
+async def main(app, coro, sock: socket.socket, state: ServerState):
+    """
+    Socket engine, the connections over
+    MAX_CONNECTIONS are answered with 503.
+    """
     loop = asyncio.get_running_loop()
+    sock.setblocking(False)
     while True:
         _sock, _ = await loop.sock_accept(sock)
-        result = asyncio.create_task(
-            client_handler(app, coro, _sock))
+        if not state.admit():
+            state.track(asyncio.create_task(reject(loop, _sock)))
+            continue
 
-
-def run_server(app, coro):
-    return asyncio.run(
-        main(
-            app,
-            coro,
-            create_socket(
-                app.settings.SERVER_HOST,
-                app.settings.SERVER_PORT
+        state.track(
+            asyncio.create_task(
+                client_handler(app, coro, _sock, state)
             )
         )
+
+
+ENGINES = {
+    'socket': main,
+    'protocol': protocol.serve
+}
+
+
+async def run_engine(app, coro, sock: socket.socket):
+    """
+    Runs the engine selected by the SERVER_ENGINE
+    setting until SIGTERM or SIGINT is received, then
+    stops accepting and drains the open connections
+    for up to SHUTDOWN_TIMEOUT seconds.
+    """
+    loop = asyncio.get_running_loop()
+    state = ServerState.from_settings(app.settings)
+    stop = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    engine = asyncio.create_task(
+        ENGINES[app.settings.SERVER_ENGINE](app, coro, sock, state)
     )
+    stopping = asyncio.create_task(stop.wait())
+    try:
+        await asyncio.wait(
+            (engine, stopping),
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if engine.done():
+            return engine.result()
+
+        engine.cancel()
+        await asyncio.wait((engine,))
+        sock.close()
+        await state.drain(app.settings.SHUTDOWN_TIMEOUT)
+
+    finally:
+        stopping.cancel()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(signum)
+
+
+def serve(app, coro, sock: socket.socket):
+    set_event_loop_policy(app.settings.EVENT_LOOP)
+    return asyncio.run(run_engine(app, coro, sock))
+
+
+def run_server(app, coro):
+    """
+    Runs the server in the current process or,
+    if WORKERS > 1, in the forked worker processes.
+    With SO_REUSEPORT every worker binds its own
+    socket and the kernel balances the connections,
+    otherwise the workers share the listening socket.
+    """
+    host = app.settings.SERVER_HOST
+    port = app.settings.SERVER_PORT
+    if app.settings.WORKERS <= 1 or not hasattr(os, 'fork'):
+        return serve(app, coro, create_socket(host, port))
+
+    if hasattr(socket, 'SO_REUSEPORT'):
+        def worker():
+            serve(app, coro, create_socket(host, port, reuse_port=True))
+    else:
+        sock = create_socket(host, port)
+
+        def worker():
+            serve(app, coro, sock)
+
+    return Supervisor(app.settings.WORKERS, worker).run()
@@ -0,0 +1,13 @@
+class BadRequest(Exception):
+    status = b'400 Bad Request'
+
+    def __init__(self, reason):
+        super().__init__(f'Bad request: {reason}.')
+
+
+class ContentTooLarge(BadRequest):
+    status = b'413 Content Too Large'
+
+    def __init__(self, size, max_size):
+        super().__init__(
+            f'the body of {size} bytes is larger than {max_size} bytes')
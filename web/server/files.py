@@ -0,0 +1,138 @@
+__all__ = [
+    'read_chunks',
+    'sock_sendfile',
+    'transport_sendfile'
+]
+
+import socket
+import asyncio
+
+from typing import (
+    Awaitable,
+    Callable,
+    AsyncGenerator,
+    BinaryIO,
+    Union
+)
+from web.http import (
+    HttpResponse,
+    FileResponse,
+    HTTP_STATUS_404
+)
+from web.core.executor import (
+    IOExecutor,
+    run_io
+)
+
+CHUNK_SIZE = 65536
+
+
+async def read_chunks(
+        file: BinaryIO,
+        count: int,
+        executor: Union[IOExecutor, None] = None
+) -> AsyncGenerator[bytes, None]:
+    """
+    Reads up to count bytes of the file
+    in chunks of CHUNK_SIZE in the executor.
+    """
+    while count > 0 and (chunk := await run_io(
+            executor, file.read, min(CHUNK_SIZE, count))):
+        count -= len(chunk)
+        yield chunk
+
+
+def not_found(response: FileResponse) -> bytes:
+    """
+    Returns the 404 sent in place of the response
+    whose file could not be opened, the connection
+    is kept as the response would have kept it.
+    """
+    return HttpResponse(
+        status=HTTP_STATUS_404,
+        body=HTTP_STATUS_404[1].encode(),
+        headers={
+            'Content-Type': 'text/plain',
+            'Connection': response.headers.get('Connection', 'close')
+        }
+    ).as_http()
+
+
+async def open_file(
+        response: FileResponse,
+        executor: Union[IOExecutor, None] = None
+) -> Union[BinaryIO, None]:
+    """
+    Opens the file of the response in the executor,
+    returns None if it has been removed.
+    """
+    try:
+        return await run_io(executor, open, response.path, 'rb')
+    except FileNotFoundError:
+        return None
+
+
+async def sock_sendfile(
+        loop: asyncio.AbstractEventLoop,
+        _sock: socket.socket,
+        response: FileResponse,
+        executor: Union[IOExecutor, None] = None
+) -> None:
+    """
+    Sends the head and then the parts of the response,
+    the slices of the file with os.sendfile where the
+    event loop supports it. The file is opened and,
+    without sendfile, read in the executor. The head is
+    sent once the file is open, otherwise 404 is sent.
+    """
+    if (file := await open_file(response, executor)) is None:
+        return await loop.sock_sendall(_sock, not_found(response))
+
+    await loop.sock_sendall(_sock, response.as_http(body=False))
+    with file:
+        for part in response.parts:
+            if isinstance(part, bytes):
+                await loop.sock_sendall(_sock, part)
+                continue
+
+            offset, size = part
+            try:
+                await loop.sock_sendfile(_sock, file, offset, size)
+            except NotImplementedError:
+                # the event loop has no sock_sendfile (uvloop).
+                file.seek(offset)
+                async for chunk in read_chunks(file, size, executor):
+                    await loop.sock_sendall(_sock, chunk)
+
+
+async def transport_sendfile(
+        loop: asyncio.AbstractEventLoop,
+        transport: asyncio.Transport,
+        response: FileResponse,
+        write: Callable[[bytes], Awaitable[None]],
+        executor: Union[IOExecutor, None] = None
+) -> None:
+    """
+    Writes the head and then the parts of the response
+    to the transport, the chunks are written with write
+    if the loop cannot send the file to the transport.
+    The file is opened and read in the executor. The head
+    is written once the file is open, otherwise 404 is.
+    """
+    if (file := await open_file(response, executor)) is None:
+        return await write(not_found(response))
+
+    await write(response.as_http(body=False))
+    with file:
+        for part in response.parts:
+            if isinstance(part, bytes):
+                await write(part)
+                continue
+
+            offset, size = part
+            try:
+                await loop.sendfile(transport, file, offset, size)
+            except NotImplementedError:
+                file.seek(offset)
+                async for chunk in read_chunks(file, size, executor):
+                    await write(chunk)
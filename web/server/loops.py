@@ -0,0 +1,60 @@
+__all__ = [
+    'EVENT_LOOPS',
+    'set_event_loop_policy'
+]
+
+import sys
+import asyncio
+
+from typing import (
+    Callable,
+    Union
+)
+
+EVENT_LOOPS = (
+    'asyncio',
+    'uvloop'
+)
+
+PolicyFactory = Callable[[], asyncio.AbstractEventLoopPolicy]
+
+
+def fallback(reason: str) -> str:
+    sys.stderr.write(
+        f'{reason}, falling back to the asyncio event loop.\n')
+    asyncio.set_event_loop_policy(None)
+    return 'asyncio'
+
+
+def set_event_loop_policy(event_loop: Union[str, PolicyFactory]) -> str:
+    """
+    Installs the event loop policy selected by
+    the EVENT_LOOP setting: 'asyncio', 'uvloop' or
+    a factory returning a policy. If the loop is not
+    available, the default asyncio policy is used.
+    Returns the name of the installed event loop.
+    """
+    if callable(event_loop):
+        try:
+            policy = event_loop()
+        except Exception as exc:
+            return fallback(f'Event loop policy factory failed: {exc!r}')
+
+        if not isinstance(policy, asyncio.AbstractEventLoopPolicy):
+            return fallback(
+                f'{policy!r} is not an event loop policy')
+
+        asyncio.set_event_loop_policy(policy)
+        return type(policy).__name__
+
+    if event_loop == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            return fallback('uvloop is not installed')
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return 'uvloop'
+
+    asyncio.set_event_loop_policy(None)
+    return 'asyncio'
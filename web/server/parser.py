@@ -0,0 +1,263 @@
+__all__ = [
+    'HEAD_END',
+    'MAX_HEAD_SIZE',
+    'IDLE',
+    'HEAD',
+    'BODY',
+    'error_response',
+    'parse_head',
+    'RequestParser'
+]
+
+import re
+
+from typing import Union
+
+from web.server.exceptions import (
+    BadRequest,
+    ContentTooLarge
+)
+
+HEAD_END = b'\r\n\r\n'
+CRLF = b'\r\n'
+MAX_HEAD_SIZE = 65536
+
+CONTENT_LENGTH = re.compile(rb'[0-9]+')
+CHUNK_SIZE = re.compile(rb'[0-9a-fA-F]+')
+# chunk_size while the trailers are read.
+TRAILERS = -1
+
+# phases of reading the request.
+IDLE = 'idle'
+HEAD = 'head'
+BODY = 'body'
+ParsedRequest = tuple[bytes, bool]
+
+
+def error_response(exc: BadRequest) -> bytes:
+    """
+    Returns the response closing the
+    connection of the rejected request.
+    """
+    return (
+        b'HTTP/1.1 %s\r\n'
+        b'Content-Length: 0\r\n'
+        b'Connection: close\r\n\r\n' % exc.status
+    )
+
+
+def parse_head(head: bytes) -> tuple[bool, int, bool]:
+    """
+    Returns whether the connection should be
+    kept alive after the request, the length
+    of the request body and whether the body
+    is sent in chunks. The requests whose body
+    length is ambiguous are rejected: a repeated
+    or malformed Content-Length, Content-Length
+    together with Transfer-Encoding or a
+    Transfer-Encoding that is not chunked.
+    """
+    lines = head.split(CRLF)
+    version = lines[0].rpartition(b' ')[2]
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        if name != name.rstrip():
+            raise BadRequest('whitespace before the colon')
+
+        name, value = name.strip().lower(), value.strip()
+        if name in headers:
+            # repeated headers are one comma-separated list.
+            value = headers[name] + b', ' + value
+
+        headers[name] = value
+
+    connection = headers.get(b'connection', b'').lower()
+    if version == b'HTTP/1.1':
+        keep_alive = b'close' not in connection
+    else:
+        keep_alive = b'keep-alive' in connection
+
+    if (encoding := headers.get(b'transfer-encoding')) is not None:
+        if b'content-length' in headers:
+            raise BadRequest('both Content-Length and Transfer-Encoding')
+
+        codings = encoding.lower().split(b',')
+        if codings[-1].strip() != b'chunked':
+            raise BadRequest('unsupported Transfer-Encoding')
+
+        return keep_alive, 0, True
+
+    length = headers.get(b'content-length', b'0')
+    if not CONTENT_LENGTH.fullmatch(length):
+        raise BadRequest('invalid Content-Length')
+
+    return keep_alive, int(length), False
+
+
+class RequestParser:
+    """
+    Incremental parser of the request stream of
+    one connection. The data is fed as it arrives,
+    complete requests are taken in the order in which
+    they were sent. The body is read by Content-Length
+    or decoded from Transfer-Encoding: chunked,
+    a body over max_body_size (0 is unlimited)
+    raises ContentTooLarge. A chunk size line or
+    trailers longer than MAX_HEAD_SIZE raise BadRequest.
+    """
+    __slots__ = (
+        'max_body_size',
+        'buffer',
+        'head',
+        'body',
+        'keep_alive',
+        'length',
+        'chunked',
+        'chunk_size',
+        'trailers_size'
+    )
+
+    max_body_size: int
+    buffer: bytearray
+    head: Union[bytes, None]
+    body: bytearray
+    keep_alive: bool
+    length: int
+    chunked: bool
+    chunk_size: Union[int, None]
+    trailers_size: int
+
+    def __init__(self, max_body_size: int = 0) -> None:
+        self.max_body_size = max_body_size
+        self.buffer = bytearray()
+        self.body = bytearray()
+        self.reset()
+
+    def reset(self) -> None:
+        self.head = None
+        self.body.clear()
+        self.keep_alive = False
+        self.length = 0
+        self.chunked = False
+        self.chunk_size = None
+        self.trailers_size = 0
+
+    @property
+    def pending(self) -> bool:
+        """
+        True if a part of the next request
+        has already been received.
+        """
+        return bool(self.buffer) or self.head is not None
+
+    @property
+    def phase(self) -> str:
+        """
+        Which part of the request is being read:
+        nothing yet (IDLE), the head or the body.
+        """
+        if self.head is not None:
+            return BODY
+
+        return HEAD if self.buffer else IDLE
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        self.buffer += data
+
+    def read_head(self) -> bool:
+        buffer = self.buffer
+        end = buffer.find(HEAD_END)
+        if end == -1:
+            if len(buffer) > MAX_HEAD_SIZE:
+                raise BadRequest('request head is too large')
+
+            return False
+
+        end += len(HEAD_END)
+        self.head = bytes(buffer[:end])
+        del buffer[:end]
+        self.keep_alive, self.length, self.chunked = (
+            parse_head(self.head[:-len(HEAD_END)])
+        )
+        self.check_size(self.length)
+        return True
+
+    def check_size(self, size: int) -> None:
+        if 0 < self.max_body_size < size:
+            raise ContentTooLarge(size, self.max_body_size)
+
+    def read_body(self) -> bool:
+        buffer = self.buffer
+        if len(buffer) < self.length:
+            return False
+
+        self.body += buffer[:self.length]
+        del buffer[:self.length]
+        return True
+
+    def read_chunks(self) -> bool:
+        buffer = self.buffer
+        while True:
+            if self.chunk_size is None:
+                if (end := buffer.find(CRLF)) == -1:
+                    if len(buffer) > MAX_HEAD_SIZE:
+                        raise BadRequest('chunk size line is too large')
+
+                    return False
+
+                size = bytes(buffer[:end]).partition(b';')[0]
+                if not CHUNK_SIZE.fullmatch(size.rstrip(b' \t')):
+                    raise BadRequest('invalid chunk size')
+
+                self.chunk_size = int(size, 16)
+                self.check_size(len(self.body) + self.chunk_size)
+                del buffer[:end + len(CRLF)]
+                if self.chunk_size == 0:
+                    self.chunk_size = TRAILERS
+
+            if self.chunk_size == TRAILERS:
+                # trailers up to an empty line.
+                end = buffer.find(CRLF)
+                if (self.trailers_size + (len(buffer) if end == -1 else end)
+                        > MAX_HEAD_SIZE):
+                    raise BadRequest('trailers are too large')
+
+                if end == -1:
+                    return False
+
+                self.trailers_size += end + len(CRLF)
+                del buffer[:end + len(CRLF)]
+                if end == 0:
+                    return True
+
+                continue
+
+            if len(buffer) < self.chunk_size + len(CRLF):
+                return False
+
+            end = self.chunk_size + len(CRLF)
+            if buffer[self.chunk_size:end] != CRLF:
+                raise BadRequest('chunk data is not followed by CRLF')
+
+            self.body += buffer[:self.chunk_size]
+            del buffer[:end]
+            self.chunk_size = None
+
+    def next_request(self) -> Union[ParsedRequest, None]:
+        """
+        Returns the next complete request and whether
+        the connection should be kept alive after it,
+        or None if more data is needed.
+        """
+        if self.head is None and not self.read_head():
+            return None
+
+        if not (self.read_chunks() if self.chunked else self.read_body()):
+            return None
+
+        request = self.head + self.body
+        keep_alive = self.keep_alive
+        self.reset()
+
+        return bytes(request), keep_alive
@@ -0,0 +1,234 @@
+__all__ = [
+    'HttpProtocol',
+    'serve'
+]
+
+import socket
+import asyncio
+
+from collections import deque
+from typing import Union
+
+from web.http import FileResponse
+from web.server.parser import (
+    IDLE,
+    RequestParser,
+    error_response
+)
+from web.server.exceptions import BadRequest
+from web.server.files import transport_sendfile
+from web.server.state import (
+    SERVICE_UNAVAILABLE,
+    ServerState
+)
+
+MAX_PIPELINE = 32
+
+
+class HttpProtocol(asyncio.Protocol):
+    """
+    Connection of the protocol engine. The requests
+    are parsed incrementally as the data arrives and
+    answered in order by a single task per batch of
+    pipelined requests, the writing waits while the
+    transport asks to pause it. A connection over
+    MAX_CONNECTIONS is answered with 503 and closed.
+    Between the requests a timer of the current reading
+    phase closes the connection if the client stalls.
+    """
+    __slots__ = (
+        'app',
+        'coro',
+        'state',
+        'admitted',
+        'loop',
+        'parser',
+        'transport',
+        'client',
+        'requests',
+        'task',
+        'writable',
+        'timer',
+        'timer_phase',
+        'bad_request',
+        'reading_paused'
+    )
+
+    transport: Union[asyncio.Transport, None]
+    requests: deque[tuple[bytes, bool]]
+    task: Union[asyncio.Task, None]
+    timer: Union[asyncio.TimerHandle, None]
+    timer_phase: Union[str, None]
+    bad_request: Union[BadRequest, None]
+
+    def __init__(self, app, coro, state: ServerState) -> None:
+        self.app = app
+        self.coro = coro
+        self.state = state
+        self.admitted = False
+        self.loop = asyncio.get_running_loop()
+        self.parser = RequestParser(state.max_body_size)
+        self.transport = None
+        self.client = None
+        self.requests = deque()
+        self.task = None
+        self.writable = asyncio.Event()
+        self.writable.set()
+        self.timer = None
+        self.timer_phase = None
+        self.bad_request = None
+        self.reading_paused = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.client = transport.get_extra_info('peername')
+        if self.state.admit():
+            self.admitted = True
+            self.set_timer()
+        else:
+            transport.write(SERVICE_UNAVAILABLE)
+            transport.close()
+
+    def connection_lost(self, exc: Union[Exception, None]) -> None:
+        self.cancel_timer()
+        self.requests.clear()
+        self.writable.set()
+        if self.task is not None:
+            self.task.cancel()
+
+        if self.admitted:
+            self.state.release()
+
+    def data_received(self, data: bytes) -> None:
+        self.parser.feed(data)
+        try:
+            while (parsed := self.parser.next_request()) is not None:
+                self.requests.append(parsed)
+                self.state.stats.requests += 1
+
+        except BadRequest as exc:
+            self.state.stats.bad_requests += 1
+            self.bad_request = exc
+            self.transport.pause_reading()
+            self.reading_paused = True
+
+        if len(self.requests) >= MAX_PIPELINE and not self.reading_paused:
+            self.transport.pause_reading()
+            self.reading_paused = True
+
+        if self.task is None:
+            if self.requests or self.bad_request is not None:
+                self.start()
+            else:
+                self.set_timer()
+
+    def eof_received(self) -> Union[bool, None]:
+        # keeps the transport open until the queued
+        # requests have been answered.
+        return self.task is not None
+
+    def pause_writing(self) -> None:
+        self.writable.clear()
+
+    def resume_writing(self) -> None:
+        self.writable.set()
+
+    async def write(self, data: bytes) -> None:
+        await self.writable.wait()
+        self.transport.write(data)
+
+    async def process(self) -> None:
+        """
+        Answers the queued requests in the order
+        in which they were received.
+        """
+        keep_alive = True
+        try:
+            while self.requests and keep_alive:
+                request, keep_alive = self.requests.popleft()
+                keep_alive = keep_alive and not self.state.draining
+                response = await self.coro(
+                    self.app, request, self.client, keep_alive)
+                if not isinstance(response, FileResponse):
+                    await self.write(response)
+                elif not self.transport.is_closing():
+                    await transport_sendfile(
+                        self.loop, self.transport, response, self.write,
+                        self.app.io_executor)
+
+                if self.reading_paused and self.bad_request is None:
+                    self.transport.resume_reading()
+                    self.reading_paused = False
+
+            if keep_alive and self.bad_request is not None:
+                await self.write(error_response(self.bad_request))
+                keep_alive = False
+
+        except Exception:
+            self.transport.close()
+            raise
+        finally:
+            self.task = None
+
+        if (not keep_alive
+                or self.state.draining
+                or self.transport.is_closing()):
+            self.transport.close()
+        elif self.requests:
+            self.start()
+        else:
+            self.set_timer()
+
+    def start(self) -> None:
+        self.cancel_timer()
+        self.task = self.state.track(
+            self.loop.create_task(self.process())
+        )
+
+    def set_timer(self) -> None:
+        """
+        Starts the timer of the current reading phase,
+        the running timer is kept while the phase is
+        the same, so a slow client cannot extend it.
+        Only an idle connection is closed by the drain.
+        """
+        phase = self.parser.phase
+        if self.timer_phase == phase:
+            return None
+
+        self.cancel_timer()
+        if phase == IDLE:
+            self.state.idle.add(self.transport.close)
+        self.timer_phase = phase
+        if timeout := self.state.timeouts.get(phase):
+            self.timer = self.loop.call_later(timeout, self.expire)
+
+    def cancel_timer(self) -> None:
+        self.state.idle.discard(self.transport.close)
+        self.timer_phase = None
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def expire(self) -> None:
+        self.timer = None
+        self.state.stats.timeouts[self.timer_phase] += 1
+        self.transport.close()
+
+
+async def serve(app, coro, sock: socket.socket, state: ServerState):
+    """
+    Runs the protocol engine on the listening socket.
+    Open connections are left to the drain on stop,
+    so Server.serve_forever is not used: it waits
+    for all of them to close when it is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: HttpProtocol(app, coro, state),
+        sock=sock
+    )
+    try:
+        await loop.create_future()
+    finally:
+        server.close()
@@ -0,0 +1,183 @@
+__all__ = [
+    'SERVICE_UNAVAILABLE',
+    'ServerStats',
+    'ServerState',
+    'stats'
+]
+
+import asyncio
+
+from typing import (
+    Callable,
+    Union
+)
+from web.server.parser import (
+    IDLE,
+    HEAD,
+    BODY
+)
+
+Closer = Callable[[], object]
+Timeouts = dict[str, Union[float, None]]
+
+SERVICE_UNAVAILABLE = (
+    b'HTTP/1.1 503 Service Unavailable\r\n'
+    b'Content-Length: 0\r\n'
+    b'Retry-After: 1\r\n'
+    b'Connection: close\r\n\r\n'
+)
+
+
+class ServerStats:
+    """
+    Counters of the server running in the process,
+    timeouts are counted by the phase of reading
+    in which the connection stalled.
+    """
+    __slots__ = (
+        'connections',
+        'rejected',
+        'requests',
+        'bad_requests',
+        'timeouts'
+    )
+
+    connections: int
+    rejected: int
+    requests: int
+    bad_requests: int
+    timeouts: dict[str, int]
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.rejected = 0
+        self.requests = 0
+        self.bad_requests = 0
+        self.timeouts = {
+            IDLE: 0,
+            HEAD: 0,
+            BODY: 0
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            'connections': self.connections,
+            'rejected': self.rejected,
+            'requests': self.requests,
+            'bad_requests': self.bad_requests,
+            'timeouts': dict(self.timeouts)
+        }
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.as_dict()}>'
+
+
+stats = ServerStats()
+
+
+class ServerState:
+    """
+    State of the server running in the process:
+    admission of connections up to MAX_CONNECTIONS,
+    tracked connection tasks and the graceful drain.
+    """
+    __slots__ = (
+        'max_connections',
+        'max_body_size',
+        'timeouts',
+        'stats',
+        'connections',
+        'tasks',
+        'idle',
+        'draining'
+    )
+
+    max_connections: int
+    max_body_size: int
+    timeouts: Timeouts
+    stats: ServerStats
+    connections: int
+    tasks: set[asyncio.Task]
+    idle: set[Closer]
+    draining: bool
+
+    def __init__(
+            self,
+            max_connections: int = 0,
+            timeouts: Union[Timeouts, None] = None,
+            max_body_size: int = 0
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_body_size = max_body_size
+        self.timeouts = timeouts or {}
+        self.stats = stats
+        self.connections = 0
+        self.tasks = set()
+        self.idle = set()
+        self.draining = False
+
+    @property
+    def full(self) -> bool:
+        return 0 < self.max_connections <= self.connections
+
+    @classmethod
+    def from_settings(cls, settings) -> 'ServerState':
+        return cls(
+            settings.MAX_CONNECTIONS,
+            {
+                IDLE: settings.KEEP_ALIVE_TIMEOUT,
+                HEAD: settings.HEADER_READ_TIMEOUT,
+                BODY: settings.BODY_READ_TIMEOUT
+            },
+            settings.MAX_BODY_SIZE
+        )
+
+    def admit(self) -> bool:
+        """
+        Takes a connection slot. If there are no free
+        slots or the server drains, returns False and
+        the caller rejects the connection with 503, so
+        the connections over the limit do not hold
+        their file descriptors.
+        """
+        self.stats.connections += 1
+        if self.full or self.draining:
+            self.stats.rejected += 1
+            return False
+
+        self.connections += 1
+        return True
+
+    def release(self) -> None:
+        self.connections -= 1
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """
+        Keeps a reference to the task
+        until it is done.
+        """
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def drain(self, timeout: float) -> None:
+        """
+        Closes idle connections, waits for the requests
+        in progress up to the timeout and cancels the
+        tasks that did not finish in time.
+        """
+        self.draining = True
+        for close in list(self.idle):
+            close()
+
+        self.idle.clear()
+        if not self.tasks:
+            return None
+
+        done, pending = await asyncio.wait(
+            set(self.tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            await asyncio.wait(pending)
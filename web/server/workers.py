@@ -0,0 +1,97 @@
+__all__ = [
+    'Supervisor'
+]
+
+import os
+import sys
+import time
+import signal
+import traceback
+
+from typing import Callable
+
+RESTART_DELAY = 1
+
+
+class Supervisor:
+    """
+    Forks the worker processes and keeps their
+    number constant: a worker that crashed is
+    restarted. SIGTERM and SIGINT are forwarded
+    to the workers and the supervisor waits for
+    them to finish.
+    """
+    __slots__ = (
+        'count',
+        'worker',
+        'workers',
+        'stopping'
+    )
+
+    count: int
+    worker: Callable[[], None]
+    workers: dict[int, float]
+    stopping: bool
+
+    def __init__(
+            self,
+            count: int,
+            worker: Callable[[], None]
+    ) -> None:
+        self.count = count
+        self.worker = worker
+        self.workers = {}
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                self.worker()
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+
+        self.workers[pid] = time.monotonic()
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.count):
+            self.spawn()
+
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            started = self.workers.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+
+            if os.waitstatus_to_exitcode(status) != 0:
+                sys.stderr.write(
+                    f'Worker {pid} exited with status '
+                    f'{os.waitstatus_to_exitcode(status)}, restarting.\n'
+                )
+                if time.monotonic() - started < RESTART_DELAY:
+                    time.sleep(RESTART_DELAY)
+
+                if not self.stopping:
+                    self.spawn()
@@ -18,7 +18,12 @@ from web.core import (
 )
 from web.utils import to_correct
 from web.core.application import Application
-from web.core.statics import get_all_statics
+from web.core.statics import (
+    get_all_statics,
+    fingerprint_static
+)
+from web.core.watcher import StaticWatcher
+from web.core.router import Router
 
 
 class Setup:
@@ -73,11 +78,36 @@ class Setup:
         dictionary from your_application.settings
         and updates the statics files dictionary
         (web.core.settings.Settings.statics).
+        With STATIC_WATCH=True the index is kept
+        up to date while the server runs.
+        With STATIC_FINGERPRINT=True every file is
+        also served at the url with the hash of its
+        content, Settings.static_manifest maps the
+        urls to the fingerprinted ones.
         """
         sfd_items = self.settings.STATIC_FILE_DIRS.items()
+        if self.settings.STATIC_WATCH:
+            watcher = StaticWatcher(
+                self.settings.set_statics,
+                self.settings.STATIC_WATCH_INTERVAL,
+                self.settings.STATIC_FINGERPRINT
+            )
+            for app_name, directories in sfd_items:
+                for root_url, catalog, media_types in directories:
+                    watcher.add_tree(
+                        root_url=to_correct(root_url),
+                        root_path=(app_name + to_correct(catalog)),
+                        media_types=media_types
+                    )
+
+            watcher.flush()
+            self.settings.static_watcher = watcher
+            return None
+
+        statics, manifest = {}, {}
         for app_name, directories in sfd_items:
             for root_url, catalog, media_types in directories:
-                self.settings.statics.update(
+                statics.update(
                     get_all_statics(
                         root_url=to_correct(root_url),
                         root_path=(app_name + to_correct(catalog)),
@@ -85,6 +115,14 @@ class Setup:
                     )
                 )
 
+        if self.settings.STATIC_FINGERPRINT:
+            for static in list(statics.values()):
+                fingerprinted = fingerprint_static(static)
+                statics[fingerprinted.url] = fingerprinted
+                manifest[static.url] = fingerprinted.url
+
+        self.settings.set_statics(statics, manifest)
+
     def set_config(self) -> Settings | NoReturn:
         """
         The function sets the settings
@@ -128,6 +166,7 @@ class Setup:
         self._install_static()
 
         self.settings.check()
+        self.settings.router = Router.from_settings(self.settings)
         self.__is_conf = True
 
         return self.settings
@@ -8,13 +8,16 @@ __all__ = [
     'lunch_trace',
     'request_trace',
     'encode',
-    'decode'
+    'decode',
+    'lazy'
 ]
 
 from typing import (
+    Callable,
     Union,
     TypeVar,
     Iterable,
+    Any
 )
 from os.path import splitext as _splitext
 from urllib.parse import quote
@@ -95,6 +98,51 @@ def encode[T](
     return obj
 
 
+class lazy:
+    """
+    Attribute of a slotted class computed by the method
+    on first access and kept in the slot '_<name>',
+    assigning the attribute stores the value directly.
+    """
+    __slots__ = (
+        'method',
+        'slot'
+    )
+
+    method: Callable[[Any], Any]
+    slot: str
+
+    def __init__(self, method: Callable[[Any], Any]) -> None:
+        self.method = method
+        self.slot = f'_{method.__name__}'
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.method(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self.slot, value)
+
+    @staticmethod
+    def reset(instance: Any, *names: str) -> None:
+        """
+        Drops the computed values of the attributes,
+        they are computed again on the next access.
+        """
+        for name in names:
+            try:
+                delattr(instance, f'_{name}')
+            except AttributeError:
+                pass
+
+
 def request_trace(request, app) -> None:
     if (app.settings.TRACING
             and app.server_type != 'uvicorn'):